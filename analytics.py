@@ -0,0 +1,296 @@
+"""Reports on the application history written by the bot.
+
+    python analytics.py                 # reads output_filename / output_format from config.yaml
+    python analytics.py --input output.jsonl --format jsonl --json
+
+The history is streamed in chunks and folded into a small state file, so
+memory stays flat however long the history is and a re-run only reads the
+rows added since the last one.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import time
+
+import yaml
+
+from resultsink import FIELDS
+
+log = logging.getLogger(__name__)
+
+CHUNK_BYTES: int = 1024 * 1024
+SQLITE_CHUNK: int = 50000
+HEAD_BYTES: int = 4096
+STATE_VERSION: int = 1
+UNKNOWN_COMBO = '(unknown)'
+
+_TRUE: set = {True, 1, 'True', 'true', '1'}
+
+
+class SpaceSaving:
+    """Approximate top-k counter in fixed memory (Metwally et al.).
+
+    Keeps at most `capacity` keys; a new key evicts the smallest one and
+    inherits its count, recorded as that key's possible overcount. Keys
+    that really are in the top k always stay in.
+    """
+
+    def __init__(self, capacity: int = 1000, counts: dict | None = None) -> None:
+        self.capacity = capacity
+        # key -> [count, error]
+        self.counts: dict = counts or {}
+
+    def add(self, key: str, n: int = 1) -> None:
+        entry: list | None = self.counts.get(key)
+        if entry is not None:
+            entry[0] += n
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = [n, 0]
+        else:
+            smallest: str = min(self.counts, key=lambda k: self.counts[k][0])
+            floor: int = self.counts.pop(smallest)[0]
+            self.counts[key] = [floor + n, floor]
+
+    def top(self, n: int) -> list:
+        return sorted(((key, count, error) for key, (count, error) in self.counts.items()),
+                      key=lambda item: -item[1])[:n]
+
+
+def _head(path: str, length: int) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+
+def read_text_rows(path: str, output_format: str, offset: int, chunk_bytes: int = CHUNK_BYTES):
+    """Yield (rows, offset after them) for the complete lines after `offset`."""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        pending: bytes = b''
+        while True:
+            chunk: bytes = f.read(chunk_bytes)
+            if not chunk:
+                return
+            data: bytes = pending + chunk
+            end: int = data.rfind(b'\n') + 1
+            # a line still being written is left for the next run
+            pending = data[end:]
+            if not end:
+                continue
+            text: str = data[:end].decode('utf-8', errors='replace')
+            if output_format == 'csv':
+                rows: list = list(csv.reader(io.StringIO(text)))
+            else:
+                rows = []
+                for line in text.splitlines():
+                    try:
+                        record: dict = json.loads(line)
+                    except ValueError:
+                        continue
+                    rows.append([record.get(k) for k in FIELDS])
+            offset += end
+            yield rows, offset
+
+
+def read_sqlite_rows(path: str, after: int, chunk_rows: int = SQLITE_CHUNK):
+    """Yield (rows, last rowid) for the results rows after rowid `after`."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        columns: set = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+        select: str = ', '.join(name if name in columns else 'NULL' for name in FIELDS)
+        while True:
+            rows: list = conn.execute(f"SELECT rowid, {select} FROM results WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                                      (after, chunk_rows)).fetchall()
+            if not rows:
+                return
+            after = rows[-1][0]
+            yield [list(row[1:]) for row in rows], after
+    finally:
+        conn.close()
+
+
+class HistoryAnalytics:
+    """Incremental aggregates over the bot's output, kept in `state_path`."""
+
+    def __init__(self, path: str, output_format: str = 'csv', state_path: str = 'analytics_state.json',
+                 companies: int = 1000) -> None:
+        if output_format not in ('csv', 'jsonl', 'sqlite'):
+            raise ValueError(f"Unknown output_format {output_format!r}, expected csv, jsonl or sqlite")
+        self.path = path
+        self.output_format = output_format
+        self.state_path = state_path
+        self.company_capacity = companies
+        self.state: dict = self.load_state()
+
+    def empty_state(self) -> dict:
+        return {'version': STATE_VERSION,
+                'source': {'path': os.path.abspath(self.path), 'format': self.output_format,
+                           'offset': 0, 'rowid': 0, 'head': None, 'head_length': 0},
+                'totals': {'rows': 0, 'easy_apply': 0, 'submitted': 0, 'duplicates': 0},
+                # hour -> [rows, easy_apply, submitted]
+                'hours': {},
+                # combo -> [rows, easy_apply, submitted]
+                'combos': {},
+                'companies': {}}
+
+    def load_state(self) -> dict:
+        if os.path.isfile(self.state_path):
+            try:
+                with open(self.state_path, encoding='utf-8') as f:
+                    state: dict = json.load(f)
+                source: dict = state.get('source', {})
+                if (state.get('version') == STATE_VERSION and source.get('path') == os.path.abspath(self.path)
+                        and source.get('format') == self.output_format):
+                    return state
+                log.info(f"{self.state_path} is for another history, starting over")
+            except ValueError as e:
+                log.info(f"{self.state_path} could not be read, starting over: {e}")
+        return self.empty_state()
+
+    def save_state(self) -> None:
+        temp: str = self.state_path + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, separators=(',', ':'))
+        os.replace(temp, self.state_path)
+
+    def source_changed(self) -> bool:
+        """True when the file was truncated or replaced since the state was saved."""
+        source: dict = self.state['source']
+        if self.output_format == 'sqlite' or not source['head_length']:
+            return False
+        if os.path.getsize(self.path) < source['offset']:
+            return True
+        return _head(self.path, source['head_length']) != source['head']
+
+    def update(self) -> int:
+        """Fold the rows added since the last update into the state; returns how many."""
+        if not os.path.isfile(self.path):
+            raise FileNotFoundError(f"No history at {self.path}")
+        if self.source_changed():
+            log.info(f"{self.path} changed underneath the saved state, reading it from the start")
+            self.state = self.empty_state()
+
+        source: dict = self.state['source']
+        companies = SpaceSaving(self.company_capacity, self.state['companies'])
+        added: int = 0
+        if self.output_format == 'sqlite':
+            for rows, rowid in read_sqlite_rows(self.path, source['rowid']):
+                added += self.add_rows(rows, companies)
+                source['rowid'] = rowid
+        else:
+            for rows, offset in read_text_rows(self.path, self.output_format, source['offset']):
+                added += self.add_rows(rows, companies)
+                source['offset'] = offset
+            source['head_length'] = min(HEAD_BYTES, source['offset'])
+            source['head'] = _head(self.path, source['head_length'])
+        self.state['companies'] = companies.counts
+        self.save_state()
+        return added
+
+    def add_rows(self, rows: list, companies: SpaceSaving) -> int:
+        totals: dict = self.state['totals']
+        hours: dict = self.state['hours']
+        combos: dict = self.state['combos']
+        added: int = 0
+        for row in rows:
+            if len(row) < 6 or not row[0] or not row[1]:
+                continue
+            timestamp, _, _, company, attempted, result = row[:6]
+            combo: str = (row[6] if len(row) > 6 else None) or UNKNOWN_COMBO
+            easy_apply: int = 1 if attempted in _TRUE else 0
+            submitted: int = 1 if result in _TRUE else 0
+
+            totals['rows'] += 1
+            totals['easy_apply'] += easy_apply
+            totals['submitted'] += submitted
+            if isinstance(result, str) and result.startswith('duplicate'):
+                totals['duplicates'] += 1
+            for bucket in (hours.setdefault(str(timestamp)[:13], [0, 0, 0]), combos.setdefault(combo, [0, 0, 0])):
+                bucket[0] += 1
+                bucket[1] += easy_apply
+                bucket[2] += submitted
+            if submitted and company:
+                companies.add(company)
+            added += 1
+        return added
+
+    def report(self, top: int = 10, recent_hours: int = 24) -> dict:
+        totals: dict = self.state['totals']
+        hours: dict = self.state['hours']
+        active: int = sum(1 for bucket in hours.values() if bucket[2])
+        recent: list = sorted(hours.items())[-recent_hours:]
+        combos: list = sorted(self.state['combos'].items(), key=lambda item: -item[1][2])
+        return {
+            'rows': totals['rows'],
+            'submitted': totals['submitted'],
+            'duplicates_skipped': totals['duplicates'],
+            'easy_apply_hit_rate': _rate(totals['easy_apply'], totals['rows']),
+            'submit_success_rate': _rate(totals['submitted'], totals['easy_apply']),
+            'applications_per_active_hour': round(totals['submitted'] / active, 2) if active else 0.0,
+            'peak_hour': max(hours.items(), key=lambda item: item[1][2])[0] if hours else None,
+            'recent_hours': [{'hour': hour, 'seen': bucket[0], 'submitted': bucket[2]} for hour, bucket in recent],
+            'combos': [{'combo': combo, 'seen': bucket[0], 'easy_apply': bucket[1], 'submitted': bucket[2],
+                        'success_rate': _rate(bucket[2], bucket[1])} for combo, bucket in combos],
+            'top_companies': [{'company': company, 'submitted': count, 'overcount': error}
+                              for company, count, error in SpaceSaving(counts=self.state['companies']).top(top)],
+        }
+
+
+def _rate(part: int, whole: int) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+def format_report(report: dict) -> str:
+    lines: list = [f"{report['rows']} jobs seen, {report['submitted']} applications submitted, "
+                   f"{report['duplicates_skipped']} reposts skipped",
+                   f"Easy Apply hit rate: {report['easy_apply_hit_rate']:.1%}   "
+                   f"submit success rate: {report['submit_success_rate']:.1%}",
+                   f"Applications per active hour: {report['applications_per_active_hour']}   "
+                   f"peak hour: {report['peak_hour']}",
+                   '',
+                   'Recent hours:']
+    lines += [f"  {hour['hour']}:00  {hour['submitted']:5d} submitted of {hour['seen']:5d} seen"
+              for hour in report['recent_hours']]
+    lines += ['', 'Position | location:']
+    lines += [f"  {combo['combo']:<50} {combo['submitted']:6d} of {combo['easy_apply']:6d} Easy Apply "
+              f"({combo['success_rate']:.1%}), {combo['seen']} seen" for combo in report['combos']]
+    lines += ['', 'Top companies:']
+    lines += [f"  {company['company']:<40} {company['submitted']:6d}"
+              + (f" (at most {company['overcount']} too many)" if company['overcount'] else '')
+              for company in report['top_companies']]
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Report on the bot's application history")
+    parser.add_argument('--config', default='config.yaml', help="read output_filename and output_format from here")
+    parser.add_argument('--input', help="history file, overrides the config")
+    parser.add_argument('--format', choices=['csv', 'jsonl', 'sqlite'], help="history format, overrides the config")
+    parser.add_argument('--state', default='analytics_state.json', help="incremental state file")
+    parser.add_argument('--rebuild', action='store_true', help="ignore the state file and read everything again")
+    parser.add_argument('--top', type=int, default=10, help="how many companies to list")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    parameters: dict = {}
+    if os.path.isfile(args.config):
+        with open(args.config, 'r') as stream:
+            parameters = yaml.safe_load(stream) or {}
+    output_filename: list = [f for f in parameters.get('output_filename', ['output.csv']) or [] if f != None]
+    path: str = args.input or (output_filename[0] if output_filename else 'output.csv')
+    output_format: str = args.format or parameters.get('output_format', 'csv')
+
+    if args.rebuild and os.path.isfile(args.state):
+        os.remove(args.state)
+    analytics = HistoryAnalytics(path, output_format, args.state)
+    start: float = time.perf_counter()
+    added: int = analytics.update()
+    log.info(f"Read {added} new rows from {path} in {time.perf_counter() - start:.2f}s")
+    report: dict = analytics.report(args.top)
+    print(json.dumps(report, indent=1) if args.json else format_report(report))
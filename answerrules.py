@@ -0,0 +1,205 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import re
+import threading
+
+from easyapplyform import FormQuestion, FormOption
+
+log = logging.getLogger(__name__)
+
+# Used when config.yaml has no question_rules. Same answers the bot always gave,
+# but matched on whole words so "state" no longer catches "statement". Profile
+# answers are only typed into free-text inputs; radio and select questions fall
+# through to yes_no, since a city or a name is never one of their options.
+TEXT_KINDS: list = ['text', 'textarea', 'number', 'tel']
+DEFAULT_RULES: list = [
+    {'name': 'first_name', 'keywords': ['first name'], 'kinds': TEXT_KINDS, 'answer': '{first_name}'},
+    {'name': 'last_name', 'keywords': ['last name'], 'kinds': TEXT_KINDS, 'answer': '{last_name}'},
+    {'name': 'address', 'keywords': ['address', 'street'], 'exclude': ['email', 'e-mail'],
+     'kinds': ['text', 'textarea'], 'answer': '{address}'},
+    {'name': 'city', 'keywords': ['city'], 'kinds': TEXT_KINDS, 'answer': '{city}'},
+    {'name': 'state', 'keywords': ['state', 'province'], 'kinds': TEXT_KINDS, 'answer': '{state}'},
+    {'name': 'zipcode', 'keywords': ['zip', 'zip code', 'postal code'], 'kinds': TEXT_KINDS, 'answer': '{zipcode}'},
+    {'name': 'country', 'keywords': ['country'], 'kinds': TEXT_KINDS, 'answer': '{country}'},
+    {'name': 'phone_number', 'keywords': ['mobile phone number', 'primary phone number', 'phone number'],
+     'kinds': ['text', 'tel', 'number'], 'answer': '{phone_number}'},
+    {'name': 'salary', 'keywords': ['salary', 'compensation'], 'kinds': ['text', 'number'], 'answer': '{salary}'},
+    {'name': 'experience', 'keywords': ['years'], 'kinds': ['text', 'number'], 'answer': '{experience}'},
+    {'name': 'referral', 'keywords': ['how did you hear about'], 'kinds': TEXT_KINDS, 'answer': 'LinkedIn'},
+    {'name': 'yes_no', 'kinds': ['radio', 'select'], 'answer': 'Yes'},
+]
+
+
+_whitespace = re.compile(r"\s+")
+_punctuation = re.compile(r"[^\w\s]")
+
+
+def normalize_question(text: str) -> str:
+    text = _punctuation.sub(' ', (text or '').lower())
+    return _whitespace.sub(' ', text).strip()
+
+
+class QuestionMatcher:
+    """Picks an answer for a FormQuestion from an ordered list of rules.
+
+    A rule matches on `keywords` (whole words, case-insensitive), a `regex`,
+    and/or input `kinds`; a rule with neither keywords nor regex matches any
+    label. Labels containing one of its `exclude` keywords are skipped. All
+    label patterns are compiled into one regex of optional lookaheads, so a
+    single match call reports every rule that applies. Earlier rules win.
+    """
+
+    def __init__(self, rules: list | None, profile: dict) -> None:
+        self.rules: list = list(rules) if rules else list(DEFAULT_RULES)
+        self.profile = profile
+        self.pattern = self.compile(self.rules)
+        self.named: dict = {rule['name']: rule for rule in self.rules if rule.get('name')}
+
+    @staticmethod
+    def compile(rules: list):
+        def words(keywords) -> list:
+            return [r'\b' + r'\s+'.join(map(re.escape, keyword.lower().split())) + r'\b'
+                    for keyword in keywords or []]
+
+        lookaheads: list = []
+        for index, rule in enumerate(rules):
+            alternatives: list = words(rule.get('keywords'))
+            if rule.get('regex'):
+                alternatives.append(f"(?:{rule['regex']})")
+            if alternatives:
+                lookaheads.append(f"(?=[\\s\\S]*?(?P<r{index}>{'|'.join(alternatives)}))?")
+            if rule.get('exclude'):
+                lookaheads.append(f"(?=[\\s\\S]*?(?P<x{index}>{'|'.join(words(rule['exclude']))}))?")
+        return re.compile('^' + ''.join(lookaheads), re.IGNORECASE)
+
+    def matching_rules(self, question: FormQuestion) -> list:
+        groups: dict = self.pattern.match(question.label or '').groupdict()
+        matched: list = []
+        for index, rule in enumerate(self.rules):
+            kinds = rule.get('kinds')
+            if kinds and question.kind not in kinds:
+                continue
+            if groups.get(f"x{index}") is not None:
+                continue
+            has_pattern: bool = bool(rule.get('keywords') or rule.get('regex'))
+            if not has_pattern or groups.get(f"r{index}") is not None:
+                matched.append(rule)
+        return matched
+
+    def render(self, rule: dict):
+        answer = rule.get('answer')
+        if answer is None:
+            return None
+        try:
+            answer = str(answer).format_map(self.profile)
+        except (KeyError, ValueError) as e:
+            log.info(f"Question rule {rule.get('name')} has an unusable answer {answer!r}: {e}")
+            return None
+        return answer if answer not in ('', 'None') else None
+
+    def answer(self, question: FormQuestion):
+        return self.match(question)[0]
+
+    def match(self, question: FormQuestion) -> tuple:
+        """The answer for `question` and the name of the rule that gave it, (None, None) if none did."""
+        for rule in self.matching_rules(question):
+            answer = self.render(rule)
+            if answer is None:
+                continue
+            if question.has_options:
+                return pick_option(question, answer), rule.get('name')
+            return answer, rule.get('name')
+        return None, None
+
+    def answer_with(self, name: str, question: FormQuestion):
+        """Render the rule called `name` for `question` from the current profile."""
+        rule: dict | None = self.named.get(name)
+        answer = self.render(rule) if rule else None
+        if answer is None:
+            return None
+        return pick_option(question, answer) if question.has_options else answer
+
+
+def pick_option(question: FormQuestion, answer: str) -> FormOption | None:
+    options: list = [option for option in question.options if option.value or option.ref]
+    if not options:
+        return None
+    wanted: str = str(answer).strip().lower()
+    for option in options:
+        if wanted in (option.text.strip().lower(), option.value.strip().lower()):
+            return option
+    for option in options:
+        if wanted in option.text.lower():
+            return option
+    # Select the final option if the answer is not available
+    return options[-1]
+
+
+class AnswerCache:
+    """Answers that got an application submitted, keyed by normalized question text.
+
+    Answers are staged per application with `remember` and only written to
+    disk by `commit` once the application went through. An answer a rule
+    gave is stored with the rule's name and rendered again on lookup, so
+    edits to the profile in config.yaml still reach known questions.
+    """
+
+    def __init__(self, path: str | None = 'answers.json') -> None:
+        self.path = path
+        self.answers: dict = {}
+        self.pending: dict = {}
+        self._lock = threading.Lock()
+        if path and os.path.isfile(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.answers = json.load(f)
+            except ValueError as e:
+                log.info(f"Answer cache {path} could not be read, starting empty: {e}")
+
+    def lookup(self, question: FormQuestion, matcher: QuestionMatcher | None = None) -> tuple:
+        """The cached answer for `question` and the rule it came from, (None, None) if there is none."""
+        entry: dict | None = self.answers.get(normalize_question(question.label))
+        if not entry or entry.get('kind') != question.kind:
+            return None, None
+        rule: str | None = entry.get('rule')
+        if rule and matcher is not None:
+            answer = matcher.answer_with(rule, question)
+            if answer is not None:
+                return answer, rule
+        if question.has_options:
+            return pick_option(question, entry['answer']), rule
+        return entry['answer'], rule
+
+    def remember(self, question: FormQuestion, answer, rule: str | None = None) -> None:
+        key: str = normalize_question(question.label)
+        if not key:
+            return
+        value = answer.text if isinstance(answer, FormOption) else answer
+        self.pending[key] = {'kind': question.kind, 'answer': value}
+        if rule:
+            self.pending[key]['rule'] = rule
+
+    def discard(self) -> None:
+        self.pending = {}
+
+    def commit(self) -> None:
+        pending, self.pending = self.pending, {}
+        if not pending:
+            return
+        with self._lock:
+            if self.path and os.path.isfile(self.path):
+                # other workers may share the file, keep what they learned
+                try:
+                    with open(self.path, encoding='utf-8') as f:
+                        self.answers.update(json.load(f))
+                except ValueError:
+                    pass
+            self.answers.update(pending)
+            if not self.path:
+                return
+            temp: str = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(self.answers, f, indent=1, sort_keys=True)
+            os.replace(temp, self.path)
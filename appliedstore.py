@@ -0,0 +1,159 @@
+from __future__ import annotations
+import csv
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+log = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class AppliedJobsStore:
+    """Set-like record of the jobIDs the bot has already handled.
+
+    Membership is checked against an in-memory set of the IDs inside the
+    retention window, so `jobID in store` is O(1) no matter how long the
+    history gets. Subclasses decide where the history is persisted.
+    """
+
+    def __init__(self, retention_days: float | None = 2) -> None:
+        self.retention_days = retention_days
+        self._ids: set = set()
+        # taken by a worker but not recorded yet
+        self._claimed: set = set()
+        self._lock = threading.Lock()
+
+    def cutoff(self) -> str | None:
+        if self.retention_days is None:
+            return None
+        return (datetime.now() - timedelta(days=self.retention_days)).strftime(TIMESTAMP_FORMAT)
+
+    def __contains__(self, jobID) -> bool:
+        try:
+            return int(jobID) in self._ids
+        except (TypeError, ValueError):
+            return False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(set(self._ids))
+
+    def claim(self, jobID) -> bool:
+        """Atomically mark a job as taken; False if it is already known or claimed."""
+        with self._lock:
+            if int(jobID) in self._ids:
+                return False
+            self._ids.add(int(jobID))
+            self._claimed.add(int(jobID))
+            return True
+
+    def release(self, jobIDs) -> None:
+        """Give back claims on jobs that were never recorded, so a later visit picks them up again."""
+        with self._lock:
+            for jobID in jobIDs:
+                if int(jobID) in self._claimed:
+                    self._claimed.discard(int(jobID))
+                    self._ids.discard(int(jobID))
+
+    def add(self, jobID, timestamp: str | None = None) -> None:
+        timestamp = timestamp or datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self._lock:
+            self._ids.add(int(jobID))
+            self._claimed.discard(int(jobID))
+            self._persist([(int(jobID), timestamp)])
+
+    def import_csv(self, filename) -> int:
+        return 0
+
+    def close(self) -> None:
+        pass
+
+    def _persist(self, rows: list) -> None:
+        pass
+
+
+class MemoryAppliedJobsStore(AppliedJobsStore):
+    """Non-persistent store, useful for dry runs and benchmarks."""
+
+
+class SqliteAppliedJobsStore(AppliedJobsStore):
+    """AppliedJobsStore persisted to an SQLite file indexed on jobID and timestamp."""
+
+    def __init__(self, path: str = 'applied_jobs.db', retention_days: float | None = 2) -> None:
+        super().__init__(retention_days)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS applied (
+                jobID INTEGER PRIMARY KEY,
+                timestamp TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS applied_timestamp ON applied (timestamp);
+            CREATE TABLE IF NOT EXISTS imports (
+                path TEXT PRIMARY KEY,
+                rows INTEGER NOT NULL,
+                imported_at TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+        self.reload()
+
+    def reload(self) -> None:
+        cutoff = self.cutoff()
+        with self._lock:
+            if cutoff is None:
+                cursor = self.conn.execute("SELECT jobID FROM applied")
+            else:
+                cursor = self.conn.execute("SELECT jobID FROM applied WHERE timestamp > ?", (cutoff,))
+            self._ids = {row[0] for row in cursor} | self._claimed
+
+    def _persist(self, rows: list) -> None:
+        self.conn.executemany("""
+            INSERT INTO applied (jobID, timestamp) VALUES (?, ?)
+            ON CONFLICT (jobID) DO UPDATE SET timestamp = max(timestamp, excluded.timestamp)
+        """, rows)
+        self.conn.commit()
+
+    def import_csv(self, filename) -> int:
+        """Import an existing output CSV once; later calls for the same file are no-ops."""
+        if not os.path.isfile(filename):
+            return 0
+        path: str = os.path.abspath(filename)
+        if self.conn.execute("SELECT 1 FROM imports WHERE path = ?", (path,)).fetchone():
+            return 0
+
+        rows: list = []
+        with open(filename, newline='', encoding='utf-8') as f:
+            for record in csv.reader(f):
+                if len(record) < 2:
+                    continue
+                try:
+                    datetime.strptime(record[0], TIMESTAMP_FORMAT)
+                    rows.append((int(record[1]), record[0]))
+                except ValueError:
+                    # header line or a partially written row
+                    continue
+
+        with self._lock:
+            self._persist(rows)
+            self.conn.execute("INSERT INTO imports (path, rows, imported_at) VALUES (?, ?, ?)",
+                              (path, len(rows), datetime.now().strftime(TIMESTAMP_FORMAT)))
+            self.conn.commit()
+        self.reload()
+        log.info(f"Imported {len(rows)} rows from {filename} into {self.path}")
+        return len(rows)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def open_store(path: str | None = 'applied_jobs.db', retention_days: float | None = 2) -> AppliedJobsStore:
+    if not path or path == ':memory:':
+        return MemoryAppliedJobsStore(retention_days)
+    return SqliteAppliedJobsStore(path, retention_days)
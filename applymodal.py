@@ -0,0 +1,145 @@
+from __future__ import annotations
+import logging
+from dataclasses import dataclass, field
+
+log = logging.getLogger(__name__)
+
+STATES: tuple = ('upload', 'questions', 'review', 'submit', 'error', 'done', 'closed', 'unknown')
+
+# Reads the whole Easy Apply modal in one round trip: which step it is on,
+# the button that moves it forward, empty file inputs and validation errors.
+MODAL_PROBE_SCRIPT = """
+// the confirmation LinkedIn shows once the application went through; never the Easy Apply modal itself
+if (document.querySelector('[data-test-modal-id="post-apply-modal"], #post-apply-modal')) {
+    return {state: 'done'};
+}
+var modal = document.querySelector('.jobs-easy-apply-modal, [data-test-modal-id="easy-apply-modal"]');
+if (!modal) {
+    return {state: 'closed'};
+}
+var errors = [];
+modal.querySelectorAll("[data-test-form-element-error-message='true'], .artdeco-inline-feedback--error")
+    .forEach(function (el) {
+        var text = (el.innerText || '').trim();
+        if (text) { errors.push(text); }
+    });
+var submit = modal.querySelector("button[aria-label='Submit application']");
+var review = modal.querySelector("button[aria-label='Review your application']");
+var next = modal.querySelector("button[aria-label='Continue to next step']");
+var uploads = [];
+modal.querySelectorAll("input[type='file']").forEach(function (input) {
+    if (!input.files || input.files.length === 0) {
+        uploads.push({input: input, id: input.id || input.name || ''});
+    }
+});
+var fields = modal.querySelectorAll(
+    "input:not([type='file']):not([type='hidden']):not(#follow-company-checkbox), select, textarea").length;
+var follow = modal.querySelector('#follow-company-checkbox');
+var state = errors.length ? 'error'
+    : submit ? 'submit'
+    : review ? 'review'
+    : uploads.length ? 'upload'
+    : (fields || next) ? 'questions'
+    : 'unknown';
+return {
+    state: state,
+    button: submit || review || next,
+    submits: !!submit,
+    uploads: uploads,
+    fields: fields,
+    errors: errors,
+    follow: follow && follow.checked ? modal.querySelector("label[for='follow-company-checkbox']") : null
+};
+"""
+
+
+@dataclass
+class ModalStep:
+    state: str
+    # the element that moves the modal on: next, review or submit
+    button: object | None = None
+    # the button is the submit one, whatever state the errors put the step in
+    submits: bool = False
+    uploads: list = field(default_factory=list)
+    fields: int = 0
+    errors: list = field(default_factory=list)
+    # label of a checked "follow company" box
+    follow: object | None = None
+
+
+@dataclass
+class ApplyOutcome:
+    submitted: bool = False
+    steps: int = 0
+    # why the application did not go through, None when it did
+    reason: str | None = None
+
+
+def probe_modal(browser) -> ModalStep:
+    record = browser.execute_script(MODAL_PROBE_SCRIPT) or {}
+    state: str = record.get('state') if record.get('state') in STATES else 'unknown'
+    return ModalStep(state=state,
+                     button=record.get('button'),
+                     submits=bool(record.get('submits')),
+                     uploads=record.get('uploads') or [],
+                     fields=record.get('fields') or 0,
+                     errors=record.get('errors') or [],
+                     follow=record.get('follow'))
+
+
+class EasyApplyModal:
+    """Walks the Easy Apply modal one step at a time.
+
+    Each step is a single probe, then whatever that state needs: files
+    for 'upload', answers for 'questions' and 'error', and a click on the
+    step's button. The walk ends when the confirmation dialog shows or
+    the modal closes after the submit click, or fails with a reason when
+    either happens before it, a step is not recognised, errors persist
+    after answering again, or `max_steps` is used up.
+    """
+
+    def __init__(self, browser, max_steps: int = 10) -> None:
+        self.browser = browser
+        self.max_steps = max_steps
+
+    def run(self, upload, answer, pause) -> ApplyOutcome:
+        """upload(step), answer() and pause() are supplied by the bot."""
+        outcome = ApplyOutcome()
+        submit_clicked: bool = False
+        previous_errors: list | None = None
+        while outcome.steps < self.max_steps:
+            step: ModalStep = probe_modal(self.browser)
+            outcome.steps += 1
+            log.debug("Easy Apply step %d: %s", outcome.steps, step.state)
+
+            if step.state in ('done', 'closed'):
+                # only trusted after our own submit click
+                if submit_clicked:
+                    outcome.submitted = True
+                else:
+                    outcome.reason = f"the Easy Apply modal went to '{step.state}' before submitting"
+                return outcome
+            if step.state == 'unknown' or step.button is None:
+                outcome.reason = f"unrecognised Easy Apply step after {outcome.steps - 1} steps"
+                return outcome
+            if step.state == 'error':
+                if step.errors == previous_errors:
+                    outcome.reason = f"form errors persist: {'; '.join(step.errors)}"
+                    return outcome
+                previous_errors = step.errors
+            else:
+                previous_errors = None
+
+            if step.uploads:
+                upload(step)
+            if step.fields:
+                answer()
+            if step.submits:
+                if step.follow is not None:
+                    step.follow.click()
+                submit_clicked = True
+            step.button.click()
+            pause()
+
+        outcome.reason = f"step limit of {self.max_steps} reached"
+        return outcome
@@ -0,0 +1,506 @@
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import NoSuchElementException
+
+log = logging.getLogger(__name__)
+
+
+# how an element handed out by a script is written to the trace
+ELEMENT_KEY = '__element__'
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+
+
+def _is_element(value) -> bool:
+    # a WebElement, or anything else that can be clicked and typed into
+    return hasattr(value, 'click') and hasattr(value, 'send_keys')
+
+
+def _walk(value, convert):
+    """Apply `convert` to every element in a script result or argument list."""
+    if isinstance(value, dict):
+        return {key: _walk(item, convert) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_walk(item, convert) for item in value]
+    return convert(value) if _is_element(value) else value
+
+
+def _recorded(value):
+    """Recorded and replayed elements as their paths, so they can be written and keyed."""
+    return _walk(value, lambda element: {ELEMENT_KEY: getattr(element, 'path', None)})
+
+
+class BrowserBackend:
+    """The slice of the Selenium driver API that EasyApplyBot uses.
+
+    Window management calls are no-ops unless a backend needs them.
+    """
+
+    # False for backends serving saved pages, where there is nothing to log in to
+    needs_login: bool = True
+
+    def get(self, url: str) -> None:
+        raise NotImplementedError
+
+    def find_element(self, by, value):
+        elements: list = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+    def find_elements(self, by, value) -> list:
+        raise NotImplementedError
+
+    def execute_script(self, script: str, *args):
+        raise NotImplementedError
+
+    @property
+    def page_source(self) -> str:
+        raise NotImplementedError
+
+    @property
+    def title(self) -> str:
+        raise NotImplementedError
+
+    @property
+    def current_url(self) -> str:
+        raise NotImplementedError
+
+    def set_window_size(self, width, height) -> None:
+        pass
+
+    def set_window_position(self, x, y) -> None:
+        pass
+
+    def maximize_window(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def quit(self) -> None:
+        self.close()
+
+
+class SeleniumBackend(BrowserBackend):
+    """Passes everything through to a live WebDriver."""
+
+    def __init__(self, driver) -> None:
+        self.driver = driver
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def get(self, url: str) -> None:
+        self.driver.get(url)
+
+    def find_elements(self, by, value) -> list:
+        return self.driver.find_elements(by, value)
+
+    def execute_script(self, script: str, *args):
+        return self.driver.execute_script(script, *args)
+
+    @property
+    def page_source(self) -> str:
+        return self.driver.page_source
+
+    @property
+    def title(self) -> str:
+        return self.driver.title
+
+    @property
+    def current_url(self) -> str:
+        return self.driver.current_url
+
+    def set_window_size(self, width, height) -> None:
+        self.driver.set_window_size(width, height)
+
+    def set_window_position(self, x, y) -> None:
+        self.driver.set_window_position(x, y)
+
+    def maximize_window(self) -> None:
+        self.driver.maximize_window()
+
+    def close(self) -> None:
+        self.driver.close()
+
+    def quit(self) -> None:
+        self.driver.quit()
+
+
+class RecordingBackend(SeleniumBackend):
+    """Live backend that writes every answer the browser gives to `directory`.
+
+    Calls are keyed by the last URL passed to get(), the call and its
+    arguments, and appended to trace.jsonl as they happen. The HTML of every
+    visited page is saved under pages/ for the stub server.
+    """
+
+    def __init__(self, driver, directory: str) -> None:
+        super().__init__(driver)
+        self.directory = directory
+        self.page: str = ''
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, 'pages'), exist_ok=True)
+        self._trace = open(os.path.join(directory, 'trace.jsonl'), 'a', encoding='utf-8')
+
+    def record(self, key: str, value):
+        with self._lock:
+            self._trace.write(json.dumps({'key': key, 'value': value}, default=str) + '\n')
+            self._trace.flush()
+        return value
+
+    def key(self, *parts) -> str:
+        return f"{self.page}|{_digest(*parts)}"
+
+    def snapshot(self) -> None:
+        if not self.page:
+            return
+        try:
+            html: str = self.driver.page_source
+        except Exception as e:
+            log.debug("Could not snapshot %s: %s", self.page, e)
+            return
+        name: str = _digest(self.page) + '.html'
+        with open(os.path.join(self.directory, 'pages', name), 'w', encoding='utf-8') as f:
+            f.write(html)
+        self.record('pages', {'url': self.page, 'file': name})
+
+    def get(self, url: str) -> None:
+        self.snapshot()
+        self.driver.get(url)
+        self.page = url
+
+    def find_elements(self, by, value) -> list:
+        key: str = self.key('find_elements', by, value)
+        elements: list = self.driver.find_elements(by, value)
+        self.record(key, len(elements))
+        return [RecordingElement(self, element, f"{key}#{i}") for i, element in enumerate(elements)]
+
+    def execute_script(self, script: str, *args):
+        key: str = self.key('execute_script', script, _recorded(args))
+        value = self.driver.execute_script(script, *_walk(args, lambda element: getattr(element, 'element', element)))
+        count: int = 0
+
+        def wrap(element) -> RecordingElement:
+            nonlocal count
+            count += 1
+            return RecordingElement(self, element, f"{key}#{count - 1}")
+
+        # elements in the result are handed out wrapped, and written as their paths
+        value = _walk(value, wrap)
+        self.record(key, _recorded(value))
+        return value
+
+    @property
+    def page_source(self) -> str:
+        return self.record(self.key('page_source'), self.driver.page_source)
+
+    @property
+    def title(self) -> str:
+        return self.record(self.key('title'), self.driver.title)
+
+    @property
+    def current_url(self) -> str:
+        return self.record(self.key('current_url'), self.driver.current_url)
+
+    def close(self) -> None:
+        self.snapshot()
+        self._trace.close()
+        self.driver.close()
+
+
+class RecordingElement:
+    def __init__(self, backend: RecordingBackend, element, path: str) -> None:
+        self.backend = backend
+        self.element = element
+        self.path = path
+
+    def _record(self, name: str, value):
+        return self.backend.record(f"{self.path}|{name}", value)
+
+    @property
+    def text(self) -> str:
+        return self._record('text', self.element.text)
+
+    @property
+    def tag_name(self) -> str:
+        return self._record('tag_name', self.element.tag_name)
+
+    def get_attribute(self, name: str):
+        return self._record(f"attr:{name}", self.element.get_attribute(name))
+
+    def is_displayed(self) -> bool:
+        return self._record('displayed', self.element.is_displayed())
+
+    def is_enabled(self) -> bool:
+        return self._record('enabled', self.element.is_enabled())
+
+    def click(self) -> None:
+        self.element.click()
+
+    def clear(self) -> None:
+        self.element.clear()
+
+    def send_keys(self, *value) -> None:
+        self.element.send_keys(*value)
+
+    def find_elements(self, by, value) -> list:
+        key: str = f"{self.path}|{_digest('find_elements', by, value)}"
+        elements: list = self.element.find_elements(by, value)
+        self.backend.record(key, len(elements))
+        return [RecordingElement(self.backend, element, f"{key}#{i}") for i, element in enumerate(elements)]
+
+    def find_element(self, by, value):
+        elements: list = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+
+class ReplayBackend(BrowserBackend):
+    """Serves a recorded session from disk, with an optional fixed latency per call.
+
+    Answers for the same key are replayed in the order they were recorded;
+    once they run out the last one keeps being returned, so a replayed run
+    that polls a little more or less than the live run still completes.
+    """
+
+    # a recording may have been made on a saved session, with no login in it
+    needs_login = False
+
+    def __init__(self, directory: str, latency: float = 0.0) -> None:
+        self.directory = directory
+        self.latency = latency
+        self.page: str = ''
+        self.round_trips: int = 0
+        self.actions: list = []
+        self.answers: dict = {}
+        self.pages: dict = {}
+        self._cursor: dict = {}
+        with open(os.path.join(directory, 'trace.jsonl'), encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry: dict = json.loads(line)
+                except ValueError:
+                    continue
+                if entry['key'] == 'pages':
+                    self.pages[entry['value']['url']] = entry['value']['file']
+                else:
+                    self.answers.setdefault(entry['key'], []).append(entry['value'])
+
+    def answer(self, key: str, default=None):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+        answers: list | None = self.answers.get(key)
+        if not answers:
+            return default
+        index: int = self._cursor.get(key, 0)
+        self._cursor[key] = index + 1
+        return answers[min(index, len(answers) - 1)]
+
+    def key(self, *parts) -> str:
+        return f"{self.page}|{_digest(*parts)}"
+
+    def get(self, url: str) -> None:
+        self.answer('get')
+        self.page = url
+        self.actions.append(('get', url))
+
+    def find_elements(self, by, value) -> list:
+        key: str = self.key('find_elements', by, value)
+        return [ReplayElement(self, f"{key}#{i}") for i in range(self.answer(key, 0))]
+
+    def execute_script(self, script: str, *args):
+        return self.revive(self.answer(self.key('execute_script', script, _recorded(args))))
+
+    def revive(self, value):
+        """Recorded element paths back into ReplayElements."""
+        if isinstance(value, dict):
+            if set(value) == {ELEMENT_KEY}:
+                return ReplayElement(self, value[ELEMENT_KEY])
+            return {key: self.revive(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.revive(item) for item in value]
+        return value
+
+    @property
+    def page_source(self) -> str:
+        source = self.answer(self.key('page_source'))
+        if source is None and self.page in self.pages:
+            with open(os.path.join(self.directory, 'pages', self.pages[self.page]), encoding='utf-8') as f:
+                source = f.read()
+        return source or '<html></html>'
+
+    @property
+    def title(self) -> str:
+        return self.answer(self.key('title'), '')
+
+    @property
+    def current_url(self) -> str:
+        return self.answer(self.key('current_url'), self.page)
+
+
+class ReplayElement:
+    def __init__(self, backend: ReplayBackend, path: str) -> None:
+        self.backend = backend
+        self.path = path
+
+    def _answer(self, name: str, default=None):
+        return self.backend.answer(f"{self.path}|{name}", default)
+
+    @property
+    def text(self) -> str:
+        return self._answer('text', '')
+
+    @property
+    def tag_name(self) -> str:
+        return self._answer('tag_name', '')
+
+    def get_attribute(self, name: str):
+        return self._answer(f"attr:{name}")
+
+    def is_displayed(self) -> bool:
+        return self._answer('displayed', True)
+
+    def is_enabled(self) -> bool:
+        return self._answer('enabled', True)
+
+    def click(self) -> None:
+        self.backend.answer('click')
+        self.backend.actions.append(('click', self.path))
+
+    def clear(self) -> None:
+        self.backend.answer('clear')
+        self.backend.actions.append(('clear', self.path))
+
+    def send_keys(self, *value) -> None:
+        self.backend.answer('send_keys')
+        self.backend.actions.append(('send_keys', self.path))
+
+    def find_elements(self, by, value) -> list:
+        key: str = f"{self.path}|{_digest('find_elements', by, value)}"
+        return [ReplayElement(self.backend, f"{key}#{i}") for i in range(self.backend.answer(key, 0))]
+
+    def find_element(self, by, value):
+        elements: list = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+
+class StubBackend(SeleniumBackend):
+    """Live browser pointed at a SnapshotServer.
+
+    linkedin.com URLs are rewritten to the server, so recorded pages load
+    in a real Chrome, scripts and all, without the network.
+    """
+
+    needs_login = False
+
+    def __init__(self, driver, server: SnapshotServer) -> None:
+        super().__init__(driver)
+        self.server = server
+
+    def get(self, url: str) -> None:
+        parts = urlsplit(url)
+        if parts.netloc.endswith('linkedin.com'):
+            url = self.server.url + parts.path + ('?' + parts.query if parts.query else '')
+        self.driver.get(url)
+
+    def close(self) -> None:
+        self.driver.close()
+        self.server.stop()
+
+    def quit(self) -> None:
+        self.driver.quit()
+        self.server.stop()
+
+
+class SnapshotServer:
+    """Local HTTP server for the pages saved by a RecordingBackend.
+
+    Requests are matched on the path and query of the recorded URL, so a
+    headless browser pointed at http://127.0.0.1:<port>/jobs/view/123 gets
+    the snapshot of https://www.linkedin.com/jobs/view/123.
+    """
+
+    def __init__(self, directory: str, port: int = 0, latency: float = 0.0) -> None:
+        self.directory = directory
+        self.latency = latency
+        self.files: dict = {}
+        trace: str = os.path.join(directory, 'trace.jsonl')
+        if os.path.isfile(trace):
+            with open(trace, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry: dict = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get('key') == 'pages':
+                        parts = urlsplit(entry['value']['url'])
+                        self.files[parts.path + ('?' + parts.query if parts.query else '')] = entry['value']['file']
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self.handler())
+        self.port: int = self.httpd.server_address[1]
+        self._thread: threading.Thread | None = None
+
+    def handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                name: str | None = server.files.get(self.path) or server.files.get(self.path.split('?')[0])
+                if name is None:
+                    self.send_error(404)
+                    return
+                with open(os.path.join(server.directory, 'pages', name), 'rb') as f:
+                    body: bytes = f.read()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                log.debug(format % args)
+
+        return Handler
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> SnapshotServer:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='snapshot-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def open_backend(mode: str, directory: str = './recordings', latency: float = 0.0, driver_factory=None):
+    """Return the browser for `mode`: 'live' (None, the bot creates its own), 'record', 'replay' or 'stub'."""
+    if mode in (None, 'live'):
+        return None
+    if mode == 'record':
+        return RecordingBackend(driver_factory(), directory)
+    if mode == 'replay':
+        return ReplayBackend(directory, latency)
+    if mode == 'stub':
+        return StubBackend(driver_factory(), SnapshotServer(directory, latency=latency).start())
+    raise ValueError(f"Unknown browser_backend {mode!r}, expected live, record, replay or stub")
@@ -0,0 +1,415 @@
+"""In-process stand-in for the WebDriver, serving the HTML fixtures in benchmarks/fixtures.
+
+The bot's page scripts can't run without a browser, so FakeDriver
+recognises each of them and answers from the parsed fixtures, the way
+the script would have: job cards from the search results page, the
+readiness probe, the Easy Apply modal one step at a time, the form
+snapshot and fill. Every call that would cross to a real browser counts
+as a round trip.
+"""
+from __future__ import annotations
+import glob
+import os
+import random
+import re
+import string
+import sys
+from collections import Counter
+from urllib.parse import parse_qs, urlsplit
+
+import lxml.html
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from applymodal import MODAL_PROBE_SCRIPT  # noqa: E402
+from backends import BrowserBackend  # noqa: E402
+from easyapplyform import FORM_FILL_SCRIPT, FORM_SNAPSHOT_SCRIPT  # noqa: E402
+from jobcards import JOB_CARDS_SCRIPT  # noqa: E402
+from lazypage import FRAGMENT_SCRIPT  # noqa: E402
+from pageready import PROBE_SCRIPT  # noqa: E402
+from supervisor import DISMISS_SCRIPT  # noqa: E402
+
+FIXTURES: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+USER_AGENT_SCRIPT = "return navigator.userAgent;"
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) FakeDriver/1.0'
+# job IDs of the first results page start here, later pages are offset by start=
+JOB_ID_BASE: int = 3900000000
+
+WORDS: list = ['python', 'django', 'team', 'experience', 'remote', 'design', 'build', 'systems', 'scale',
+               'customers', 'data', 'cloud', 'benefits', 'salary', 'years', 'engineering', 'product',
+               'services', 'api', 'postgres', 'kubernetes', 'aws', 'ownership', 'mentor', 'ship', 'quality',
+               'testing', 'reliable', 'growth', 'payments', 'platform', 'mission', 'hybrid', 'office',
+               'equity', 'insurance', 'learning', 'collaborate', 'roadmap', 'latency', 'pipelines']
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _text(element) -> str:
+    return ' '.join(element.text_content().split()) if element is not None else ''
+
+
+def _first(elements: list):
+    return elements[0] if elements else None
+
+
+def _select(root, selector: str):
+    """First element matching a single '.class', '#id' or 'tag' selector; enough for the bot's fragments."""
+    selector = selector.strip()
+    if selector.startswith('.'):
+        return _first(root.xpath(f"//*[{_has_class(selector[1:])}]"))
+    if selector.startswith('#'):
+        return _first(root.xpath(f"//*[@id='{selector[1:]}']"))
+    if re.fullmatch(r"[a-z0-9]+", selector):
+        return _first(root.xpath(f"//{selector}"))
+    return None
+
+
+def _card_text(card, classes: list) -> str | None:
+    for name in classes:
+        element = _first(card.xpath(f".//*[{_has_class(name)}]"))
+        if element is not None and _text(element):
+            return element.text_content().strip().split('\n')[0]
+    return None
+
+
+def read_cards(path: str) -> list:
+    """The JOB_CARDS_SCRIPT records of a results page fixture."""
+    root = lxml.html.parse(path).getroot()
+    records: list = []
+    for card in root.xpath('//div[@data-job-id]'):
+        footer = _first(card.xpath(f".//*[{_has_class('job-card-container__footer-wrapper')} or "
+                                   f"{_has_class('job-card-list__footer-wrapper')}]"))
+        footer_text: str | None = _text(footer) if footer is not None else None
+        records.append({
+            'jobID': int(card.get('data-job-id')),
+            'title': _card_text(card, ['job-card-list__title', 'job-card-container__link',
+                                       'artdeco-entity-lockup__title']),
+            'company': _card_text(card, ['job-card-container__primary-description', 'job-card-container__company-name',
+                                         'artdeco-entity-lockup__subtitle']),
+            'location': _card_text(card, ['job-card-container__metadata-item', 'artdeco-entity-lockup__caption']),
+            'easyApply': None if footer_text is None else bool(re.search('easy apply', footer_text, re.I)),
+            'applied': footer_text is not None and bool(re.search(r'\bapplied\b', footer_text, re.I)),
+        })
+    return records
+
+
+class ModalFixture:
+    """One step of the Easy Apply modal, parsed once up front."""
+
+    def __init__(self, path: str) -> None:
+        self.name: str = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding='utf-8') as f:
+            root = lxml.html.fragment_fromstring(f.read(), create_parent='div')
+        self.done: bool = bool(root.xpath("//*[@data-test-modal-id='post-apply-modal' or @id='post-apply-modal']"))
+        modal = _first(root.xpath(f"//*[{_has_class('jobs-easy-apply-modal')}]"))
+        self.open: bool = modal is not None
+        if modal is None:
+            return
+        self.errors: list = [_text(element) for element in modal.xpath(
+            f".//*[@data-test-form-element-error-message='true' or {_has_class('artdeco-inline-feedback--error')}]")
+            if _text(element)]
+        self.button: str | None = None
+        for label in ('Submit application', 'Review your application', 'Continue to next step'):
+            if modal.xpath(f".//button[@aria-label='{label}']"):
+                self.button = label
+                break
+        self.uploads: list = [element.get('id') or element.get('name') or ''
+                              for element in modal.xpath(".//input[@type='file']")]
+        self.fields: int = len(modal.xpath(".//input[not(@type='file') and not(@type='hidden') and "
+                                           "not(@id='follow-company-checkbox')] | .//select | .//textarea"))
+        follow = _first(modal.xpath(".//input[@id='follow-company-checkbox']"))
+        self.follow: bool = follow is not None and follow.get('checked') is not None
+        self.questions: list = self.read_questions(modal)
+
+    @staticmethod
+    def read_questions(modal) -> list:
+        """FORM_SNAPSHOT_SCRIPT records, with refs counted from 0."""
+        def label_for(element) -> str:
+            label = _first(modal.xpath(f".//label[@for='{element.get('id')}']")) if element.get('id') else None
+            return _text(label) if label is not None else (element.get('value') or '')
+
+        questions: list = []
+        ref: int = 0
+        for element in modal.xpath(f".//*[{_has_class('jobs-easy-apply-form-element')}]"):
+            heading = _first(element.xpath('.//legend | .//label'))
+            question: dict = {'label': heading.text_content().strip().split('\n')[0] if heading is not None else '',
+                              'kind': None, 'ref': None, 'value': None, 'options': []}
+            radios: list = element.xpath(".//input[@type='radio']")
+            if radios:
+                question['kind'] = 'radio'
+                for radio in radios:
+                    question['options'].append({'text': label_for(radio), 'value': radio.get('value'),
+                                                'ref': str(ref)})
+                    ref += 1
+            else:
+                target = None
+                if heading is not None and heading.get('for'):
+                    target = _first(modal.xpath(f".//*[@id='{heading.get('for')}']"))
+                target = target if target is not None else _first(element.xpath('.//select | .//textarea | .//input'))
+                if target is None:
+                    continue
+                question['ref'] = str(ref)
+                ref += 1
+                question['kind'] = 'select' if target.tag == 'select' else 'textarea' if target.tag == 'textarea' \
+                    else (target.get('type') or 'text')
+                question['value'] = target.get('checked') is not None if question['kind'] == 'checkbox' \
+                    else target.get('value') or ''
+                question['options'] = [{'text': _text(option), 'value': option.get('value'), 'ref': None}
+                                       for option in target.xpath('.//option')]
+            questions.append(question)
+        return questions
+
+
+class FakeElement:
+    def __init__(self, driver: FakeDriver, name: str, on_click=None, on_keys=None) -> None:
+        self.driver = driver
+        self.name = name
+        self.on_click = on_click
+        self.on_keys = on_keys
+
+    @property
+    def text(self) -> str:
+        self.driver.round_trip('element_text')
+        return self.name
+
+    def get_attribute(self, name: str):
+        self.driver.round_trip('element_attribute')
+        return None
+
+    def is_displayed(self) -> bool:
+        self.driver.round_trip('element_displayed')
+        return True
+
+    def is_enabled(self) -> bool:
+        self.driver.round_trip('element_enabled')
+        return True
+
+    def click(self) -> None:
+        self.driver.round_trip('click')
+        self.driver.actions.append(('click', self.name))
+        if self.on_click:
+            self.on_click()
+
+    def clear(self) -> None:
+        self.driver.round_trip('clear')
+
+    def send_keys(self, *value) -> None:
+        self.driver.round_trip('send_keys')
+        self.driver.actions.append(('send_keys', self.name))
+        if self.on_keys:
+            self.on_keys()
+
+
+class FakeDriver(BrowserBackend):
+    """Serves `pages` pages of search results, a job page per result and the
+    Easy Apply modal steps in fixtures/easy_apply, in file name order.
+
+    Every `repost_every`th card repeats the previous card's job under a new
+    jobID, with the same description, for the bot's repost detection.
+    """
+
+    def __init__(self, fixtures: str = FIXTURES, pages: int = 4, repost_every: int = 10, seed: int = 0) -> None:
+        self.pages = pages
+        self.repost_every = repost_every
+        self.seed = seed
+        self.cards: list = read_cards(os.path.join(fixtures, 'search_results.html'))
+        with open(os.path.join(fixtures, 'job_page.html'), encoding='utf-8') as f:
+            self.job_template = string.Template(f.read())
+        # selectors are resolved once against the unfilled page, the fragment is filled in per job
+        self.job_root = lxml.html.fromstring(self.job_template.template)
+        self.fragments: dict = {}
+        self.steps: list = [ModalFixture(path) for path in sorted(glob.glob(os.path.join(fixtures, 'easy_apply', '*.html')))]
+        self.scripts: dict = {PROBE_SCRIPT: self.probe,
+                              JOB_CARDS_SCRIPT: self.job_cards,
+                              MODAL_PROBE_SCRIPT: self.modal_probe,
+                              FORM_SNAPSHOT_SCRIPT: self.form_snapshot,
+                              FORM_FILL_SCRIPT: self.form_fill,
+                              FRAGMENT_SCRIPT: self.fragment,
+                              DISMISS_SCRIPT: self.dismiss,
+                              USER_AGENT_SCRIPT: lambda *args: USER_AGENT}
+        self.script_names: dict = {PROBE_SCRIPT: 'probe', JOB_CARDS_SCRIPT: 'job_cards',
+                                   MODAL_PROBE_SCRIPT: 'modal_probe', FORM_SNAPSHOT_SCRIPT: 'form_snapshot',
+                                   FORM_FILL_SCRIPT: 'form_fill', FRAGMENT_SCRIPT: 'fragment',
+                                   DISMISS_SCRIPT: 'dismiss', USER_AGENT_SCRIPT: 'user_agent'}
+        self.calls: Counter = Counter()
+        self.actions: list = []
+        # jobID -> (title, company, description seed) of the cards handed out so far
+        self.jobs: dict = {}
+        self.url: str = 'about:blank'
+        self.page: str = 'blank'
+        self.start: int = 0
+        self.job: tuple | None = None
+        self.step: int | None = None
+        self.uploaded: set = set()
+        self.refs: int = 0
+        self.submitted: int = 0
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.calls.values())
+
+    def round_trip(self, kind: str) -> None:
+        self.calls[kind] += 1
+
+    def reset_counters(self) -> None:
+        self.calls.clear()
+        self.actions.clear()
+        self.submitted = 0
+
+    # navigation
+
+    def get(self, url: str) -> None:
+        self.round_trip('get')
+        self.actions.append(('get', url))
+        self.url = url
+        self.step = None
+        parts = urlsplit(url)
+        if parts.path.startswith('/login'):
+            self.page = 'login'
+        elif parts.path.startswith('/jobs/search'):
+            self.page = 'search'
+            self.start = int(parse_qs(parts.query).get('start', ['0'])[0])
+        elif parts.path.startswith('/jobs/view/'):
+            self.page = 'job'
+            jobID: int = int(parts.path.rstrip('/').split('/')[-1])
+            self.job = self.jobs.get(jobID, ('Software Engineer', 'Acme', jobID))
+        else:
+            self.page = 'other'
+
+    @property
+    def title(self) -> str:
+        self.round_trip('title')
+        if self.page == 'job':
+            return f"{self.job[0]} | {self.job[1]} | LinkedIn"
+        return 'Jobs | LinkedIn' if self.page == 'search' else 'LinkedIn'
+
+    @property
+    def current_url(self) -> str:
+        self.round_trip('current_url')
+        return self.url
+
+    @property
+    def page_source(self) -> str:
+        self.round_trip('page_source')
+        if self.page == 'job':
+            return self.job_template.substitute(title=self.job[0], company=self.job[1],
+                                                description=self.description(self.job[2]))
+        return '<html></html>'
+
+    def find_elements(self, by, value) -> list:
+        self.round_trip('find_elements')
+        if self.page == 'login':
+            on_click = self.logged_in if 'button' in value else None
+            return [FakeElement(self, f"login {value}", on_click=on_click)]
+        if self.page == 'job' and 'jobs-apply-button' in value:
+            return [FakeElement(self, 'Easy Apply', on_click=self.open_modal)]
+        return []
+
+    def logged_in(self) -> None:
+        self.url = 'https://www.linkedin.com/feed/'
+        self.page = 'feed'
+
+    def execute_script(self, script: str, *args):
+        self.round_trip(f"script:{self.script_names.get(script, 'other')}")
+        handler = self.scripts.get(script)
+        return handler(*args) if handler else None
+
+    # page scripts
+
+    def probe(self, *args) -> dict:
+        cards: int = len(self.cards) if self.page == 'search' and self.start < self.pages * len(self.cards) else 0
+        return {'readyState': 'complete', 'cards': cards, 'applyButton': self.page == 'job',
+                'quietFor': 1000, 'challenge': False, 'errorBanner': False}
+
+    def job_cards(self, *args) -> list:
+        if self.page != 'search' or self.start >= self.pages * len(self.cards):
+            return []
+        records: list = []
+        for i, card in enumerate(self.cards):
+            position: int = self.start + i
+            jobID: int = JOB_ID_BASE + self.start + card['jobID']
+            record: dict = dict(card, jobID=str(jobID))
+            if self.repost_every and position % self.repost_every == self.repost_every - 1 and records:
+                previous: dict = records[-1]
+                record.update(title=previous['title'], company=previous['company'], location=previous['location'])
+                seed: int = self.jobs[int(previous['jobID'])][2]
+            else:
+                seed = jobID
+            self.jobs[jobID] = (record['title'], record['company'], seed)
+            records.append(record)
+        return records
+
+    def description(self, seed: int) -> str:
+        rng = random.Random(seed + self.seed)
+        return ''.join(f"<p>{' '.join(rng.choice(WORDS) for _ in range(30))}</p>" for _ in range(6))
+
+    def fragment(self, selectors: str, *args) -> str | None:
+        if self.page != 'job':
+            return None
+        if selectors not in self.fragments:
+            element = None
+            for selector in selectors.split(','):
+                element = _select(self.job_root, selector)
+                if element is not None:
+                    break
+            self.fragments[selectors] = string.Template(lxml.html.tostring(element, encoding='unicode')) \
+                if element is not None else None
+        template: string.Template | None = self.fragments[selectors]
+        if template is None:
+            return None
+        return template.safe_substitute(title=self.job[0], company=self.job[1],
+                                        description=self.description(self.job[2]))
+
+    # the Easy Apply modal
+
+    def open_modal(self) -> None:
+        self.step = 0
+        self.uploaded = set()
+
+    def advance_modal(self) -> None:
+        if self.step is not None and self.step < len(self.steps) - 1:
+            self.step += 1
+            if self.steps[self.step].done:
+                self.submitted += 1
+
+    def upload(self, name: str):
+        return lambda: self.uploaded.add(name)
+
+    def modal_probe(self, *args) -> dict:
+        if self.step is None:
+            return {'state': 'closed'}
+        step: ModalFixture = self.steps[self.step]
+        if step.done:
+            return {'state': 'done'}
+        if not step.open:
+            return {'state': 'closed'}
+        uploads: list = [{'input': FakeElement(self, name, on_keys=self.upload(name)), 'id': name}
+                         for name in step.uploads if name not in self.uploaded]
+        state: str = 'error' if step.errors else 'submit' if step.button == 'Submit application' \
+            else 'review' if step.button == 'Review your application' else 'upload' if uploads \
+            else 'questions' if step.fields or step.button else 'unknown'
+        return {'state': state,
+                'button': FakeElement(self, step.button, on_click=self.advance_modal) if step.button else None,
+                'submits': step.button == 'Submit application',
+                'uploads': uploads,
+                'fields': step.fields,
+                'errors': list(step.errors),
+                'follow': FakeElement(self, 'follow company') if step.follow else None}
+
+    def form_snapshot(self, *args) -> list:
+        if self.step is None or not self.steps[self.step].open:
+            return []
+        questions: list = self.steps[self.step].questions
+        self.refs = sum(1 if question['ref'] is not None else len(question['options']) for question in questions)
+        # copies, the bot is free to keep what it is handed
+        return [dict(question, options=[dict(option) for option in question['options']]) for question in questions]
+
+    def form_fill(self, answers: list, *args) -> list:
+        return [answer.get('ref') is not None and int(answer['ref']) < self.refs for answer in answers]
+
+    def dismiss(self, *args) -> str | None:
+        if self.step is None:
+            return None
+        self.step = None
+        return 'dismissed'
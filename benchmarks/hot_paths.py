@@ -0,0 +1,346 @@
+"""Benchmarks of the bot's hot paths against an in-process fake WebDriver.
+
+    python benchmarks/hot_paths.py --output before.json
+    python benchmarks/hot_paths.py --output after.json --compare before.json
+
+Micro benchmarks time single functions: loading a large output CSV into
+the applied jobs store, write_to_file, parse_title and answering form
+questions. Macro benchmarks drive EasyApplyBot.applications_loop and
+send_resume end to end against FakeDriver (see fakedriver.py) and the
+HTML fixtures, with no network. Nothing really sleeps: SimulatedClock
+moves time forward instead, so the pacing the bot would have done is
+reported as simulated seconds, next to the CPU time it spent and the
+browser round trips it made.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fakedriver import FakeDriver  # noqa: E402
+from answerrules import AnswerCache, QuestionMatcher  # noqa: E402
+from appliedstore import open_store  # noqa: E402
+from easyapplybot import EasyApplyBot  # noqa: E402
+from easyapplyform import read_form  # noqa: E402
+from metrics import Metrics  # noqa: E402
+from resultsink import open_result_writer, parse_title  # noqa: E402
+
+REPO: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+PROFILE: dict = {'first_name': 'Ada', 'last_name': 'Lovelace', 'salary': '120000', 'experience': '5',
+                 'address': '1 Main St', 'city': 'Springfield', 'state': 'Illinois', 'zipcode': '62701',
+                 'country': 'United States', 'phone_number': '5555550100'}
+BENCHMARKS: tuple = ('applied_ids', 'write_to_file', 'parse_title', 'answers', 'applications_loop', 'send_resume')
+
+
+class SimulatedClock:
+    """Replaces time.sleep while it is active: sleeping moves time.monotonic
+    and time.time forward and adds to `slept`, without waiting."""
+
+    def __init__(self) -> None:
+        self.slept: float = 0.0
+        self.sleeps: int = 0
+        self._saved: tuple | None = None
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            self.slept += seconds
+            self.sleeps += 1
+
+    def reset(self) -> None:
+        self.slept = 0.0
+        self.sleeps = 0
+
+    def __enter__(self) -> SimulatedClock:
+        self._saved = (time.sleep, time.monotonic, time.time)
+        _, monotonic, wall = self._saved
+        time.sleep = self.sleep
+        time.monotonic = lambda: monotonic() + self.slept
+        time.time = lambda: wall() + self.slept
+        return self
+
+    def __exit__(self, *exc) -> None:
+        time.sleep, time.monotonic, time.time = self._saved
+
+
+def per_call(action, number: int, repeat: int = 5) -> dict:
+    """Microseconds per call of `action`, best and median of `repeat` runs of `number` calls."""
+    runs: list = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        for _ in range(number):
+            action()
+        runs.append((time.perf_counter() - start) / number * 1e6)
+    return {'calls': number, 'best_us': round(min(runs), 2), 'median_us': round(statistics.median(runs), 2)}
+
+
+def bare_bot(**attributes) -> EasyApplyBot:
+    """A bot without a browser or login, for timing single methods."""
+    bot = EasyApplyBot.__new__(EasyApplyBot)
+    bot.combo_label = 'Python Developer|Remote'
+    bot.__dict__.update(attributes)
+    return bot
+
+
+def make_bot(workdir: str, driver: FakeDriver) -> EasyApplyBot:
+    return EasyApplyBot(username='bench@example.com', password='not-used',
+                        uploads={'Resume': os.path.join(workdir, 'resume.pdf'),
+                                 'Cover Letter': os.path.join(workdir, 'cover-letter.pdf')},
+                        filename=os.path.join(workdir, 'output.csv'),
+                        applied_store=os.path.join(workdir, 'applied_jobs.db'),
+                        answer_cache=os.path.join(workdir, 'answers.json'),
+                        fingerprint_index=os.path.join(workdir, 'fingerprints.db'),
+                        results=open_result_writer(os.path.join(workdir, 'output.csv'),
+                                                   journal=os.path.join(workdir, 'output.journal')),
+                        metrics=Metrics(None),
+                        checkpoint=None,
+                        browser=driver,
+                        prefetch=False,
+                        prescreen=False,
+                        session_dir=None,
+                        **PROFILE)
+
+
+def close_bot(bot: EasyApplyBot) -> None:
+    bot.finish_apply()
+    bot.results.close()
+
+
+def write_history(path: str, rows: int) -> None:
+    now: datetime = datetime.now()
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for i in range(rows):
+            # all within the retention window, so every row is loaded
+            timestamp: str = (now - timedelta(seconds=i * 86400 // rows)).strftime('%Y-%m-%d %H:%M:%S')
+            writer.writerow([timestamp, 3000000000 + i, 'Python Developer', f"Company {i % 5000}", i % 3 == 0,
+                             i % 6 == 0, 'Python Developer|Remote'])
+
+
+def bench_applied_ids(workdir: str, settings: argparse.Namespace) -> dict:
+    history: str = os.path.join(workdir, 'history.csv')
+    write_history(history, settings.rows)
+    bot = bare_bot(applied_store=os.path.join(workdir, 'applied_ids.db'), retention_days=2)
+
+    start: float = time.perf_counter()
+    store = bot.get_appliedIDs(history)
+    cold: float = time.perf_counter() - start
+    store.close()
+    # the import is recorded, a later start only loads the store
+    start = time.perf_counter()
+    store = bot.get_appliedIDs(history)
+    warm: float = time.perf_counter() - start
+
+    jobIDs: list = [3000000000 + i * 7 for i in range(1000)]
+    lookup: dict = per_call(lambda: [jobID in store for jobID in jobIDs], max(1, settings.number // 100))
+    store.close()
+    return {'rows': settings.rows,
+            'loaded': len(store),
+            'first_import_seconds': round(cold, 3),
+            'restart_seconds': round(warm, 3),
+            'lookup_us': round(lookup['best_us'] / len(jobIDs), 3)}
+
+
+def bench_write_to_file(workdir: str, settings: argparse.Namespace) -> dict:
+    results: dict = {}
+    for output_format in ('csv', 'jsonl', 'sqlite'):
+        path: str = os.path.join(workdir, f"results.{output_format}")
+        bot = bare_bot(results=open_result_writer(path, output_format,
+                                                  journal=os.path.join(workdir, f"{output_format}.journal")),
+                       appliedJobIDs=open_store(None))
+        titles: list = [f"Python Developer {i} | Company {i % 500} | LinkedIn" for i in range(settings.number)]
+        start: float = time.perf_counter()
+        for i, title in enumerate(titles):
+            bot.write_to_file(True, 3000000000 + i, title, True)
+        written: float = time.perf_counter() - start
+        start = time.perf_counter()
+        bot.results.close()
+        closed: float = time.perf_counter() - start
+        results[output_format] = {'rows': settings.number,
+                                  'per_row_us': round(written / settings.number * 1e6, 2),
+                                  'close_seconds': round(closed, 3)}
+    return results
+
+
+def bench_parse_title(workdir: str, settings: argparse.Namespace) -> dict:
+    titles: list = ['(3) Senior Python Developer | Acme | LinkedIn', 'Backend Engineer | Globex',
+                    '(99+) - Data Engineer (Remote) | Initech Corp. | LinkedIn', 'LinkedIn', None, '']
+    timing: dict = per_call(lambda: [parse_title(title) for title in titles], max(1, settings.number // len(titles)))
+    return {'titles': timing['calls'] * len(titles),
+            'per_title_us': round(timing['best_us'] / len(titles), 3)}
+
+
+def bench_answers(workdir: str, settings: argparse.Namespace) -> dict:
+    driver = FakeDriver()
+    driver.open_modal()
+    questions: list = []
+    for _ in driver.steps:
+        questions += read_form(driver)
+        driver.advance_modal()
+    matcher = QuestionMatcher(None, PROFILE)
+    cold = bare_bot(question_matcher=matcher, answer_cache=AnswerCache(None))
+    warm = bare_bot(question_matcher=matcher, answer_cache=AnswerCache(None))
+    for question in questions:
+        warm.answer_cache.remember(question, *warm.choose_answer(question))
+    warm.answer_cache.commit()
+    number: int = max(1, settings.number // len(questions))
+    results: dict = {'questions': len(questions)}
+    for name, bot in (('rules', cold), ('cached', warm)):
+        timing: dict = per_call(lambda: [bot.choose_answer(question) for question in questions], number)
+        results[name] = {'per_question_us': round(timing['best_us'] / len(questions), 2),
+                         'answered': sum(1 for question in questions if bot.choose_answer(question)[0] is not None)}
+    return results
+
+
+def macro_report(driver: FakeDriver, clock: SimulatedClock, bot: EasyApplyBot, wall: float, cpu: float,
+                 units: int, latency: float) -> dict:
+    """Costs of a macro run; `units` is what the per-unit figures are divided by."""
+    units = max(1, units)
+    # Metrics rounds to milliseconds, too coarse without a browser behind the calls
+    totals: dict = {}
+    for (phase, _), histogram in bot.metrics.histograms.items():
+        total: list = totals.setdefault(phase, [0, 0.0])
+        total[0] += histogram.count
+        total[1] += histogram.sum
+    phases: dict = {phase: {'count': count, 'mean_us': round(seconds / count * 1e6, 1) if count else 0.0}
+                    for phase, (count, seconds) in sorted(totals.items())}
+    return {'wall_seconds': round(wall, 3),
+            'cpu_seconds': round(cpu, 3),
+            'round_trips': driver.round_trips,
+            'round_trips_per_unit': round(driver.round_trips / units, 1),
+            'calls': dict(sorted(driver.calls.items())),
+            'simulated_sleep_seconds': round(clock.slept, 1),
+            'simulated_sleep_per_unit': round(clock.slept / units, 1),
+            'sleeps': clock.sleeps,
+            # what a real browser would add at `latency` seconds per round trip
+            'estimated_seconds': round(clock.slept + wall + driver.round_trips * latency, 1),
+            'phases': phases}
+
+
+def bench_applications_loop(workdir: str, settings: argparse.Namespace) -> dict:
+    driver = FakeDriver(pages=settings.pages)
+    with SimulatedClock() as clock:
+        bot = make_bot(workdir, driver)
+        # login is not part of the loop
+        driver.reset_counters()
+        clock.reset()
+        bot.metrics = Metrics(None)
+        wall: float = time.perf_counter()
+        cpu: float = time.process_time()
+        stats = bot.applications_loop('Python Developer', '&location=Remote', time_budget=10 ** 9,
+                                      page_budget=settings.pages)
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+        close_bot(bot)
+    opened: int = sum(1 for kind, target in driver.actions if kind == 'get' and '/jobs/view/' in target)
+    report: dict = {'pages': stats.pages,
+                    'jobs_opened': opened,
+                    'applications': stats.applications,
+                    'submitted': driver.submitted}
+    report.update(macro_report(driver, clock, bot, wall, cpu, opened, settings.latency))
+    return report
+
+
+def bench_send_resume(workdir: str, settings: argparse.Namespace) -> dict:
+    driver = FakeDriver()
+    with SimulatedClock() as clock:
+        bot = make_bot(workdir, driver)
+        driver.get('https://www.linkedin.com/jobs/view/3900000001')
+        driver.reset_counters()
+        clock.reset()
+        bot.metrics = Metrics(None)
+        wall: float = time.perf_counter()
+        cpu: float = time.process_time()
+        for _ in range(settings.applications):
+            driver.open_modal()
+            bot.send_resume()
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+        close_bot(bot)
+    report: dict = {'applications': settings.applications,
+                    'submitted': driver.submitted,
+                    'ms_per_application': round(wall / settings.applications * 1000, 3)}
+    report.update(macro_report(driver, clock, bot, wall, cpu, settings.applications, settings.latency))
+    return report
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results: dict, prefix: str = '') -> dict:
+    flat: dict = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(before: dict, after: dict) -> str:
+    old: dict = flatten({'micro': before.get('micro', {}), 'macro': before.get('macro', {})})
+    new: dict = flatten({'micro': after.get('micro', {}), 'macro': after.get('macro', {})})
+    lines: list = [f"{before.get('meta', {}).get('commit')} -> {after.get('meta', {}).get('commit')}"]
+    for key in sorted(old.keys() & new.keys()):
+        change: str = f"{(new[key] - old[key]) / old[key]:+.1%}" if old[key] else ''
+        lines.append(f"  {key:<60} {old[key]:>12} -> {new[key]:>12}  {change}")
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help="run only these benchmarks")
+    parser.add_argument('--quick', action='store_true', help="smaller inputs, for a fast check")
+    parser.add_argument('--rows', type=int, default=200000, help="rows in the CSV history loaded by applied_ids")
+    parser.add_argument('--number', type=int, default=20000, help="calls per micro benchmark run")
+    parser.add_argument('--pages', type=int, default=4, help="results pages for applications_loop")
+    parser.add_argument('--applications', type=int, default=50, help="applications for send_resume")
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help="seconds per browser round trip, for estimated_seconds")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON file of an earlier run to compare with")
+    args = parser.parse_args()
+    if args.quick:
+        args.rows, args.number, args.pages, args.applications = 20000, 2000, 2, 10
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+
+    results: dict = {'meta': {'commit': git_commit(),
+                              'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                              'python': platform.python_version(),
+                              'machine': platform.machine(),
+                              'settings': {key: value for key, value in vars(args).items()
+                                           if key not in ('output', 'compare')}},
+                     'micro': {}, 'macro': {}}
+    for name in args.only or BENCHMARKS:
+        group: str = 'macro' if name in ('applications_loop', 'send_resume') else 'micro'
+        with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as workdir:
+            start: float = time.perf_counter()
+            results[group][name] = globals()[f"bench_{name}"](workdir, args)
+        print(f"{name}: {time.perf_counter() - start:.1f}s")
+        print(json.dumps(results[group][name], indent=1))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print(compare(json.load(f), results))
+
+
+if __name__ == '__main__':
+    main()
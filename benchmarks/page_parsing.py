@@ -0,0 +1,134 @@
+"""CPU and memory of parsing job pages: full BeautifulSoup parse vs LazyPage.
+
+    python benchmarks/page_parsing.py --pages 200 --size 3
+
+The old load_page pulled page_source and built a soup of the whole page
+on every load; LazyPage only asks the browser for the description
+fragment and parses that. The fake browser below cuts fragments out up
+front, so only the Python side of the work is measured.
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fingerprints import DESCRIPTION_SELECTORS, description_text  # noqa: E402
+from lazypage import HAVE_LXML, LazyPage  # noqa: E402
+
+WORDS: list = ['python', 'team', 'experience', 'remote', 'design', 'build', 'systems', 'scale',
+               'customers', 'data', 'cloud', 'benefits', 'salary', 'years', 'engineering']
+
+
+def job_page(size_mb: float, seed: int) -> tuple:
+    """A LinkedIn sized job page and its description fragment."""
+    rng = random.Random(seed)
+    description: str = ('<div class="jobs-description__content"><div id="job-details">'
+                        + ''.join(f"<p>{' '.join(rng.choice(WORDS) for _ in range(40))}</p>" for _ in range(30))
+                        + '</div></div>')
+    filler: list = []
+    length: int = 0
+    while length < size_mb * 1024 * 1024:
+        card: str = (f'<li class="jobs-search-results__list-item" data-occludable-job-id="{rng.randint(10 ** 9, 10 ** 10)}">'
+                     f'<div class="job-card-container"><a class="job-card-list__title" href="#">'
+                     f'{" ".join(rng.choice(WORDS) for _ in range(4))}</a><span class="artdeco-entity-lockup__subtitle">'
+                     f'Company {rng.randint(1, 500)}</span><ul><li>Easy Apply</li></ul></div></li>')
+        filler.append(card)
+        length += len(card)
+    source: str = (f'<html><head><title>Engineer | Acme | LinkedIn</title></head><body>'
+                   f'<ul>{"".join(filler)}</ul>{description}</body></html>')
+    return source, description
+
+
+class FakeBrowser:
+    def __init__(self, source: str, description: str) -> None:
+        self.source = source
+        self.description = description
+        self.transferred: int = 0
+
+    @property
+    def page_source(self) -> str:
+        self.transferred += len(self.source)
+        return self.source
+
+    def execute_script(self, script: str, *args):
+        fragment: str | None = self.description if args and args[0] == DESCRIPTION_SELECTORS else None
+        self.transferred += len(fragment or '')
+        return fragment
+
+
+def full_parse(browser: FakeBrowser):
+    from bs4 import BeautifulSoup
+    page = BeautifulSoup(browser.page_source, 'lxml' if HAVE_LXML else 'html.parser')
+    node = page.select_one(DESCRIPTION_SELECTORS)
+    return page, node.get_text(' ', strip=True)
+
+
+def lazy_parse(browser: FakeBrowser):
+    page = LazyPage(browser)
+    return page, description_text(page)
+
+
+def run(name: str, parse, browsers: list, memory_pages: int = 3) -> dict:
+    gc.collect()
+    cpu: float = time.process_time()
+    wall: float = time.perf_counter()
+    page = None
+    for browser in browsers:
+        # like bot.job_page, the previous page is only dropped when the next one is parsed
+        page, text = parse(browser)
+        assert text
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    transferred: int = sum(browser.transferred for browser in browsers)
+    del page
+
+    # tracemalloc slows allocation heavy code down a lot, so memory is measured in a separate, shorter pass
+    gc.collect()
+    tracemalloc.start()
+    for browser in browsers[:memory_pages]:
+        page, text = parse(browser)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del page
+    return {'name': name,
+            'pages': len(browsers),
+            'cpu_seconds': round(cpu, 3),
+            'wall_seconds': round(wall, 3),
+            'ms_per_page': round(wall / len(browsers) * 1000, 2),
+            'peak_mb': round(peak / 1024 / 1024, 1),
+            'transferred_mb': round(transferred / 1024 / 1024, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--size', type=float, default=2.0, help="page size in MB")
+    parser.add_argument('--distinct', type=int, default=5, help="distinct pages to cycle through")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    pages: list = [job_page(args.size, seed) for seed in range(args.distinct)]
+    results: list = []
+    for name, parse in (('full_parse', full_parse), ('lazy_parse', lazy_parse)):
+        browsers: list = [FakeBrowser(*pages[i % len(pages)]) for i in range(args.pages)]
+        try:
+            results.append(run(name, parse, browsers))
+        except ImportError as e:
+            print(f"{name}: skipped, {e}")
+    for result in results:
+        print(f"{result['name']:>12}: {result['ms_per_page']:8.2f} ms/page  cpu {result['cpu_seconds']:7.2f}s  "
+              f"peak {result['peak_mb']:7.1f} MB  transferred {result['transferred_mb']:8.1f} MB")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'parser': 'lxml' if HAVE_LXML else 'html.parser', 'results': results}, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+import copy
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'easyapplybot', 'chromedriver_path')
+
+
+def resolve_driver_path(cache_file: str = DRIVER_PATH_CACHE, refresh: bool = False) -> str | None:
+    """Path to a chromedriver binary, resolved once and then reused offline.
+
+    Order: $CHROMEDRIVER, the path cached by an earlier run, then
+    webdriver_manager (which needs the network). None lets Selenium find a
+    driver on its own. `refresh` skips the cache, for when Chrome updated
+    and the cached driver no longer matches it.
+    """
+    path = os.environ.get('CHROMEDRIVER')
+    if path and os.path.isfile(path):
+        return path
+
+    if not refresh and os.path.isfile(cache_file):
+        with open(cache_file, encoding='utf-8') as f:
+            path = f.read().strip()
+        if path and os.path.isfile(path):
+            return path
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+    except Exception as e:
+        log.info(f"chromedriver could not be downloaded, letting Selenium locate it: {e}")
+        return None
+
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        f.write(path)
+    return path
+
+
+def create_driver(options=None, headless: bool = False, profile_dir: str | None = None):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from selenium.common.exceptions import SessionNotCreatedException
+
+    # a copy, the same options are passed in again on every browser restart
+    options = copy.deepcopy(options) if options is not None else Options()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    if profile_dir:
+        profile_dir = os.path.abspath(profile_dir)
+        os.makedirs(profile_dir, exist_ok=True)
+        options.add_argument(f"--user-data-dir={profile_dir}")
+
+    path: str | None = resolve_driver_path()
+    try:
+        return webdriver.Chrome(service=Service(path) if path else Service(), options=options)
+    except SessionNotCreatedException as e:
+        # usually Chrome updated itself past the cached driver's version
+        fresh: str | None = resolve_driver_path(refresh=True)
+        if fresh == path:
+            raise
+        log.info(f"chromedriver {path} could not start Chrome, retrying with {fresh}: {e}")
+        return webdriver.Chrome(service=Service(fresh) if fresh else Service(), options=options)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """Atomically written JSON snapshot of search progress.
+
+    `save` is throttled to one write per `interval` seconds unless forced.
+    The file is written to a temp file, fsynced and renamed over the old
+    one, so a crash mid-write never leaves a torn checkpoint behind.
+    """
+
+    def __init__(self, path: str = 'checkpoint.json', interval: float = 30) -> None:
+        self.path = path
+        self.interval = interval
+        self.last_save: float = 0.0
+
+    def save(self, state: dict, force: bool = False) -> bool:
+        if not force and time.monotonic() - self.last_save < self.interval:
+            return False
+        state = dict(state, saved_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+        temp: str = self.path + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+        self.last_save = time.monotonic()
+        return True
+
+    def load(self) -> dict | None:
+        if not os.path.isfile(self.path):
+            return None
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError as e:
+            log.info(f"Checkpoint {self.path} could not be read, starting over: {e}")
+            return None
+
+    def clear(self) -> None:
+        if os.path.isfile(self.path):
+            os.remove(self.path)
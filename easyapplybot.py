@@ -1,7 +1,6 @@
 from __future__ import annotations
-import time, random, os, csv, platform
+import time, os, platform
 import logging
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.keys import Keys
@@ -9,37 +8,37 @@ from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-import pandas as pd
-import pyautogui
 
 from urllib.request import urlopen
-from webdriver_manager.chrome import ChromeDriverManager
-import re
 import yaml
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import partial
+
+from appliedstore import AppliedJobsStore, open_store
+from resultsink import BufferedResultWriter, open_result_writer, parse_title
+from pageready import PageReadiness
+from jobcards import extract_job_cards
+from jobfilter import JobFilter
+from easyapplyform import FormQuestion, read_form, fill_form
+from answerrules import AnswerCache, QuestionMatcher
+from applymodal import ApplyOutcome, EasyApplyModal, ModalStep
+from browserfactory import create_driver
+from leanmode import LeanMode
+from prefetch import ResultsPrefetcher
+from prescreen import JobPrescreener
+from scheduler import ComboScheduler, TurnStats
+from checkpoint import Checkpoint
+from pacing import Pacer
+from sessionstore import SessionStore
+from supervisor import ApplyAborted, ApplySupervisor, CircuitBreaker, CircuitOpen
+from fingerprints import Fingerprint, FingerprintIndex, description_text
+from metrics import Metrics, timed
+from lazypage import LazyPage
+from logpipeline import set_context
 
 log = logging.getLogger(__name__)
-driver = webdriver.Chrome(ChromeDriverManager().install())
-
-def setupLogger() -> None:
-    dt: str = datetime.strftime(datetime.now(), "%m_%d_%y %H_%M_%S ")
-
-    if not os.path.isdir('./logs'):
-        os.mkdir('./logs')
-
-    # TODO need to check if there is a log dir available or not
-    logging.basicConfig(filename=('./logs/' + str(dt) + 'applyJobs.log'), filemode='w',
-                        format='%(asctime)s::%(name)s::%(levelname)s::%(message)s', datefmt='./logs/%d-%b-%y %H:%M:%S')
-    log.setLevel(logging.DEBUG)
-    c_handler = logging.StreamHandler()
-    c_handler.setLevel(logging.DEBUG)
-    c_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', '%H:%M:%S')
-    c_handler.setFormatter(c_format)
-    log.addHandler(c_handler)
 
 class EasyApplyBot:
-    setupLogger()
     # MAX_SEARCH_TIME is 10 hours by default, feel free to modify it
     MAX_SEARCH_TIME = 10 * 60 * 60
     MAX_SIGN_IN_ATTEMPTS = 3
@@ -62,7 +61,41 @@ class EasyApplyBot:
                  uploads={},
                  filename='output.csv',
                  blacklist=[],
-                 blackListTitles=[]) -> None:
+                 blackListTitles=[],
+                 applied_store='applied_jobs.db',
+                 retention_days=2,
+                 output_format='csv',
+                 output_flush_rows=20,
+                 output_flush_seconds=30,
+                 page_max_wait=10,
+                 question_rules=None,
+                 answer_cache='answers.json',
+                 browser=None,
+                 results=None,
+                 headless=False,
+                 lean_mode=False,
+                 lean_block_types=None,
+                 lean_block_patterns=None,
+                 prefetch=True,
+                 prescreen=False,
+                 prescreen_concurrency=4,
+                 scheduler_settings=None,
+                 checkpoint='checkpoint.json',
+                 resume=False,
+                 metrics=None,
+                 metrics_json='metrics.json',
+                 metrics_prometheus=None,
+                 fingerprint_index='fingerprints.db',
+                 fingerprint_distance=6,
+                 filters=None,
+                 apply_max_steps=10,
+                 pacing_settings=None,
+                 pacer=None,
+                 browser_factory=None,
+                 job_retries=2,
+                 breaker_threshold=5,
+                 breaker_cooldown=300,
+                 session_dir='./sessions') -> None:
 
         log.info("Welcome to Easy Apply Bot")
         dirpath: str = os.getcwd()
@@ -82,34 +115,109 @@ class EasyApplyBot:
         self.phone_number = phone_number
 
         self.uploads = uploads
-        past_ids: list | None = self.get_appliedIDs(filename)
-        self.appliedJobIDs: list = past_ids if past_ids != None else []
+        # a worker pool hands every bot the same Metrics
+        self.metrics: Metrics = metrics if metrics is not None else Metrics(metrics_json, metrics_prometheus)
+        self.combo_label: str | None = None
+        self.question_matcher = QuestionMatcher(question_rules, self.profile())
+        self.answer_cache = AnswerCache(answer_cache)
+        self.apply_max_steps: int = apply_max_steps
+        # a worker pool hands every bot the same Pacer, they share one account
+        self.pacer: Pacer = pacer if pacer is not None else Pacer(**(pacing_settings or {}))
+        self.applied_store = applied_store
+        self.retention_days = retention_days
+        self.appliedJobIDs: AppliedJobsStore = self.get_appliedIDs(filename, output_format)
         self.filename: str = filename
-        self.options = self.browser_options()
-        self.browser = driver
-        self.wait = WebDriverWait(self.browser, 30)
+        # postings already applied to, to skip reposts under a new jobID
+        self.owns_fingerprints: bool = not isinstance(fingerprint_index, FingerprintIndex)
+        self.fingerprints: FingerprintIndex | None = \
+            FingerprintIndex(fingerprint_index, fingerprint_distance) \
+            if self.owns_fingerprints and fingerprint_index else fingerprint_index or None
+        # a worker pool hands every bot the same writer, only close what we opened
+        self.owns_results: bool = results is None
+        self.results: BufferedResultWriter = results if results is not None else \
+            open_result_writer(filename,
+                               output_format,
+                               flush_rows=output_flush_rows,
+                               flush_seconds=output_flush_seconds)
+        self.lean: LeanMode | None = LeanMode(lean_block_types, lean_block_patterns) if lean_mode else None
+        self.options = self.browser_options(self.lean)
+        # used to replace a browser that died; recorded sessions can't be restarted
+        self.browser_factory = browser_factory if browser_factory is not None or browser is not None else \
+            partial(create_driver, self.options, headless=headless)
+        self.page_max_wait = page_max_wait
+        self.prefetch: bool = prefetch
+        # the browser is only launched here, never at import time
+        self.attach_browser(browser if browser is not None else self.browser_factory())
+        self.supervisor = ApplySupervisor(self, retries=job_retries,
+                                          breaker=CircuitBreaker(breaker_threshold, breaker_cooldown))
+        # title, company and location rules, checked before anything is opened
+        self.job_filter = JobFilter(blacklist, blackListTitles, filters)
+        # prescreening borrows the browser's cookies, so it needs a live session
+        self.prescreener: JobPrescreener | None = \
+            JobPrescreener(self.job_filter, prescreen_concurrency, pacer=self.pacer) \
+            if prescreen and hasattr(self.browser, 'get_cookies') else None
         self.blacklist = blacklist
+        self.scheduler_settings: dict = scheduler_settings or {}
+        self.checkpoint: Checkpoint | None = Checkpoint(checkpoint) if checkpoint else None
+        self.resume: bool = resume
         self.blackListTitles = blackListTitles
-        self.start_linkedin(username, password)
-
-    def get_appliedIDs(self, filename) -> list | None:
+        # saved cookies of this account, shared by every worker logged in as it
+        self.session_store: SessionStore | None = SessionStore(username, session_dir) \
+            if session_dir and hasattr(self.browser, 'add_cookie') else None
+        self.sign_in()
+
+    def attach_browser(self, browser) -> None:
+        self.browser = browser
+        if self.lean:
+            self.lean.attach(self.browser)
+        self.wait = WebDriverWait(self.browser, 30)
+        self.readiness = PageReadiness(self.browser, max_wait=self.page_max_wait)
+        self.job_page = None
+        # prefetching needs real browser tabs, recorded sessions have none
+        self.prefetcher: ResultsPrefetcher | None = ResultsPrefetcher(self.browser, self.readiness) \
+            if self.prefetch and hasattr(self.browser, 'window_handles') else None
+
+    def restart_browser(self) -> None:
+        if self.browser_factory is None:
+            raise ApplyAborted("the browser session died and this backend can't start a new one")
+        log.warning("Browser session lost, starting a new one")
         try:
-            df = pd.read_csv(filename,
-                             header=0,
-                             names=['timestamp', 'jobID', 'job', 'company', 'attempted', 'result'],
-                             lineterminator='\n',
-                             encoding='utf-8')
-
-            df['timestamp'] = pd.to_datetime(df['timestamp'], format="%Y-%m-%d %H:%M:%S")
-            df = df[df['timestamp'] > (datetime.now() - timedelta(days=2))]
-            jobIDs: list = list(df.jobID)
-            log.info(f"{len(jobIDs)} jobIDs found")
-            return jobIDs
+            self.browser.quit()
         except Exception as e:
-            log.info(str(e) + "   jobIDs could not be loaded from CSV {}".format(filename))
-            return None
+            log.debug("Could not quit the old browser: %s", e)
+        try:
+            self.attach_browser(self.browser_factory())
+            self.sign_in()
+        except Exception as e:
+            raise ApplyAborted(f"could not restart the browser: {e}") from e
+
+    def profile(self) -> dict:
+        return {'first_name': self.first_name,
+                'last_name': self.last_name,
+                'salary': self.salary,
+                'experience': self.experience,
+                'address': self.address,
+                'city': self.city,
+                'state': self.state,
+                'zipcode': self.zipcode,
+                'country': self.country,
+                'phone_number': self.phone_number}
+
+    def get_appliedIDs(self, filename, output_format='csv') -> AppliedJobsStore:
+        self.owns_store: bool = not isinstance(self.applied_store, AppliedJobsStore)
+        store = open_store(self.applied_store, self.retention_days) if self.owns_store else self.applied_store
+        # a shared store was filled by its owner, and only a CSV history can be imported
+        if self.owns_store and output_format == 'csv':
+            try:
+                # only the first run against an existing CSV pays for the import
+                store.import_csv(filename)
+            except Exception as e:
+                log.info(str(e) + "   jobIDs could not be loaded from CSV {}".format(filename))
+        log.info(f"{len(store)} jobIDs found")
+        return store
 
-    def browser_options(self):
+    @staticmethod
+    def browser_options(lean: LeanMode | None = None):
         options = Options()
         options.add_argument("--start-maximized")
         options.add_argument("--ignore-certificate-errors")
@@ -119,12 +227,28 @@ class EasyApplyBot:
         # Disable webdriver flags or you will be easily detectable
         options.add_argument("--disable-blink-features")
         options.add_argument("--disable-blink-features=AutomationControlled")
+
+        if lean:
+            lean.apply_options(options)
         return options
 
+    @timed('login')
+    def sign_in(self) -> None:
+        """Reuse the account's saved session when it is still valid, log in otherwise."""
+        if not getattr(self.browser, 'needs_login', True):
+            log.info("Serving saved pages, skipping the login")
+            return
+        if self.session_store and self.session_store.restore(self.browser):
+            log.info("Reusing the saved LinkedIn session")
+            return
+        self.start_linkedin(self.username, self.password)
+        if self.session_store and "feed" in self.browser.current_url:
+            self.session_store.save(self.browser.get_cookies())
+
     def start_linkedin(self, username, password, attempt=1) -> None:
 
         if attempt > self.MAX_SIGN_IN_ATTEMPTS:
-            print("Max login attempts reached. Exiting.")
+            log.error("Max login attempts reached. Exiting.")
             return
     
         log.info("Logging in.....Please wait :)  ")
@@ -136,206 +260,367 @@ class EasyApplyBot:
                         '//*[@id="organic-div"]/form/div[3]/button')
             user_field.send_keys(username)
             user_field.send_keys(Keys.TAB)
-            time.sleep(2)
+            self.sleep(2)
             pw_field.send_keys(password)
-            time.sleep(2)
+            self.sleep(2)
             login_button.click()
-            time.sleep(3)
+            self.sleep(3)
 
              # Check if login was successful, if not, retry
             if "feed" not in self.browser.current_url:  # Assuming "feed" is in the URL after successful login
 
                 # Pause for manual security check
-                print("Please complete the security check manually and press Enter to continue...")
+                log.warning("Please complete the security check manually and press Enter to continue...")
                 input("Press Enter to continue...")
 
-                time.sleep(3)
+                self.sleep(3)
                 # After completing the security check manually, the script will resume here
                 # Verify if the login was successful
                 if "feed" in self.browser.current_url:
-                    print("Login successful.")
+                    log.info("Login successful.")
                 else:
-                    print("Login failed. Please try again.")
+                    log.warning("Login failed. Please try again.")
                     self.start_linkedin(self.username, self.password, attempt + 1)
             else:
-                print("Login successful.")
+                log.info("Login successful.")
         except TimeoutException:
             log.info("TimeoutException! Username/password field or login button not found")
 
+    def sleep(self, seconds) -> None:
+        with self.metrics.timer('sleep', self.combo_label):
+            time.sleep(seconds)
+
+    def pause(self, kind) -> None:
+        self.sleep(self.pacer.delay(kind))
+
+    def throttle(self) -> None:
+        """Wait for the pacer before an action: a navigation or a click that submits something."""
+        wait: float = self.pacer.reserve()
+        if wait > 0:
+            log.debug("Throttled for %.1fs", wait)
+            with self.metrics.timer('throttle', self.combo_label):
+                time.sleep(wait)
+
     def fill_data(self) -> None:
         self.browser.set_window_size(1, 1)
         self.browser.set_window_position(2000, 2000)
 
     def start_apply(self, positions, locations) -> None:
-        start: float = time.time()
         self.fill_data()
 
-        
-
-        combos: list = []
-        while len(combos) < len(positions) * len(locations):
-            position = positions[random.randint(0, len(positions) - 1)]
-            location = locations[random.randint(0, len(locations) - 1)]
-            combo: tuple = (position, location)
-            if combo not in combos:
-                combos.append(combo)
-                log.info(f"Applying to {position}: {location}")
-                location = "&location=" + location
-                self.applications_loop(position, location)
-            if len(combos) > 500:
+        scheduler = ComboScheduler(positions, locations,
+                                   max_seconds=self.MAX_SEARCH_TIME,
+                                   checkpoint=self.checkpoint,
+                                   **self.scheduler_settings)
+        self.restore_checkpoint(scheduler)
+        while (combo := scheduler.next()) is not None:
+            log.info("Applying to %s: %s from result %d", combo.position, combo.location, combo.offset)
+            try:
+                stats: TurnStats = self.applications_loop(combo.position,
+                                                          "&location=" + combo.location,
+                                                          start_offset=combo.offset,
+                                                          time_budget=scheduler.time_budget,
+                                                          page_budget=scheduler.page_budget,
+                                                          progress=partial(scheduler.progress, combo),
+                                                          resume_jobs=combo.inflight)
+            except ApplyAborted as e:
+                log.error("Stopping: %s", e)
+                scheduler.report(combo, TurnStats(offset=combo.offset))
                 break
+            scheduler.report(combo, stats)
+            self.metrics.write()
+        self.metrics.write()
+
+    def restore_checkpoint(self, scheduler: ComboScheduler) -> None:
+        if self.checkpoint is None:
+            return
+        state: dict | None = self.checkpoint.load() if self.resume else None
+        if state:
+            scheduler.restore(state)
+        elif self.resume:
+            log.info(f"No checkpoint found at {self.checkpoint.path}, starting a new search")
 
-    def applications_loop(self, position, location):
+    def applications_loop(self, position, location, start_offset=0, time_budget=None, page_budget=None,
+                          progress=None, resume_jobs=None) -> TurnStats:
 
-        count_application = 0
         count_job = 0
-        jobs_per_page = 0
+        jobs_per_page = start_offset
         start_time: float = time.time()
+        time_budget = time_budget or self.MAX_SEARCH_TIME
+        stats = TurnStats(offset=jobs_per_page)
+        self.combo_label = f"{position}|{location.replace('&location=', '')}"
+        set_context(combo=self.combo_label, jobID=None)
 
         log.info("Looking for jobs.. Please wait..")
 
         self.browser.set_window_position(1, 1)
         self.browser.maximize_window()
-        self.browser, _ = self.next_jobs_page(position, location, jobs_per_page)
+        opened, _ = self.supervisor.call("results page", self.next_jobs_page, position, location, jobs_per_page)
+        if not opened:
+            stats.seconds = time.time() - start_time
+            return stats
         log.info("Looking for jobs.. Please wait..")
-
-        while time.time() - start_time < self.MAX_SEARCH_TIME:
+        # claimed jobs of the current page that were not handled yet
+        unhandled: list = []
+
+        def finish_page() -> bool:
+            """Move on to the next results page; False once this turn should end."""
+            nonlocal jobs_per_page, count_job
+            jobs_per_page = jobs_per_page + 25
+            count_job = 0
+            stats.pages += 1
+            stats.offset = jobs_per_page
+            if progress:
+                progress(offset=jobs_per_page, inflight=[])
+            if self.results_exhausted(jobs_per_page):
+                stats.exhausted = True
+                return False
+            if page_budget and stats.pages >= page_budget:
+                log.info("Page budget of %s pages used up for this turn", page_budget)
+                return False
+            self.avoid_lock()
+            self.next_jobs_page(position, location, jobs_per_page)
+            return True
+
+        while time.time() - start_time < time_budget:
             try:
-                log.info(f"{(self.MAX_SEARCH_TIME - (time.time() - start_time)) // 60} minutes left in this search")
-
-                # sleep to make sure everything loads, add random to make us look human.
-                randoTime: float = random.uniform(3.5, 4.9)
-                log.debug(f"Sleeping for {round(randoTime, 1)}")
-                time.sleep(randoTime)
-                self.load_page(sleep=1)
+                log.info("%d minutes left in this search", (time_budget - (time.time() - start_time)) // 60)
 
-                time.sleep(1)
+                # look human before reading the page
+                self.pause('page')
+                self.load_page(until='cards')
 
-                # get job links, (the following are actually the job card objects)
-                links = self.browser.find_elements("xpath",
-                    '//div[@data-job-id]'
-                )
+                # read every job card on the page in one round trip
+                with self.metrics.timer('card_extraction', self.combo_label):
+                    cards: list = extract_job_cards(self.browser)
 
-                if len(links) == 0:
+                if len(cards) == 0:
                     log.debug("No links found")
+                    stats.exhausted = True
                     break
 
-                IDs: list = []
-                
-                # children selector is the container of the job cards on the left
-                for link in links:
-                    children = link.find_elements("xpath",
-                        '//ul[@class="scaffold-layout__list-container"]'
-                    )
-                    for child in children:
-                        if child.text not in self.blacklist:
-                            temp = link.get_attribute("data-job-id")
-                            jobID = temp.split(":")[-1]
-                            IDs.append(int(jobID))
-                IDs: list = set(IDs)
-
-                # remove already applied jobs
+                IDs: list = list(dict.fromkeys(card.jobID for card in cards))
+
+                # remove already applied, filtered out and non Easy Apply jobs
                 before: int = len(IDs)
-                jobIDs: list = [x for x in IDs if x not in self.appliedJobIDs]
+                candidates: dict = {card.jobID: card for card in cards
+                                    if not card.applied
+                                    and card.easyApply is not False
+                                    and card.jobID not in self.appliedJobIDs}
+                jobIDs: list = self.filter_cards(list(candidates.values()))
+                # claim them so that other workers sharing the store skip these jobs
+                jobIDs = [x for x in jobIDs if self.appliedJobIDs.claim(x)]
+                unhandled = jobIDs
                 after: int = len(jobIDs)
+                log.debug("%d job cards found, %d left after filtering", before, after)
+
+                # a full page means there may be more, start loading it now
+                if self.prefetcher and len(IDs) > 23:
+                    self.prefetcher.start(self.search_url(position, location, jobs_per_page + 25),
+                                          jobs_per_page + 25)
+
+                if self.prescreener and jobIDs:
+                    jobIDs = self.prescreen(jobIDs)
+                if resume_jobs:
+                    # jobs left in flight by an interrupted run may have moved off this page
+                    resumed: list = [x for x in resume_jobs if self.appliedJobIDs.claim(x)]
+                    if resumed:
+                        log.info("Retrying %d jobs that were in flight when the last run stopped", len(resumed))
+                    jobIDs = resumed + jobIDs
+                    resume_jobs = None
+                unhandled = jobIDs
+                if progress:
+                    progress(offset=jobs_per_page, inflight=jobIDs)
 
                 # it assumed that 25 jobs are listed in the results window
-                if len(jobIDs) == 0 and len(IDs) > 23:
-                    jobs_per_page = jobs_per_page + 25
-                    count_job = 0
-                    self.avoid_lock()
-                    self.browser, jobs_per_page = self.next_jobs_page(position,
-                                                                    location,
-                                                                    jobs_per_page)
+                if len(jobIDs) == 0:
+                    if len(IDs) <= 23:
+                        # a short last page with nothing new left on it
+                        stats.exhausted = True
+                        break
+                    if not finish_page():
+                        break
                 # loop over IDs to apply
+                turn_over: bool = False
                 for i, jobID in enumerate(jobIDs):
                     count_job += 1
-                    self.get_job_page(jobID)
-
-                    # get easy apply button
-                    button = self.get_easy_apply_button()
-                    # word filter to skip positions not wanted
-
-                    if button is not False:
-                        if any(word in self.browser.title for word in self.blackListTitles):
-                            log.info('skipping this application, a blacklisted keyword was found in the job position')
-                            string_easy = "* Contains blacklisted keyword"
-                            result = False
-                        else:
-                            string_easy = "* has Easy Apply Button"
-                            log.info("Clicking the EASY apply button")
-                            button.click()
-                            time.sleep(3)
-                            # self.fill_out_phone_number()
-                            result: bool = self.send_resume()
-                            count_application += 1
-                    else:
-                        log.info("The button does not exist.")
-                        string_easy = "* Doesn't have Easy Apply Button"
-                        result = False
-
-                    position_number: str = str(count_job + jobs_per_page)
-                    log.info(f"\nPosition {position_number}:\n {self.browser.title} \n {string_easy} \n")
-
-                    self.write_to_file(button, jobID, self.browser.title, result)
-
-                    # sleep every 20 applications
-                    if count_application != 0 and count_application % 20 == 0:
-                        sleepTime: int = random.randint(500, 900)
-                        log.info(f"""********count_application: {count_application}************\n\n
-                                    Time for a nap - see you in:{int(sleepTime / 60)} min
-                                ****************************************\n\n""")
-                        time.sleep(sleepTime)
+                    set_context(jobID=jobID)
+                    done, attempted = self.supervisor.call(f"job {jobID}", self.apply_to_job, jobID,
+                                                           count_job + jobs_per_page)
+                    if not done:
+                        # recorded, so a job that keeps failing is not opened again on every visit
+                        self.write_to_file(False, jobID, None, False)
+                    elif attempted:
+                        stats.applications += 1
+                    unhandled = jobIDs[i + 1:]
+                    if progress:
+                        progress(inflight=unhandled)
+                    if self.prefetcher:
+                        self.prefetcher.poll()
 
                     # go to new page if all jobs are done
                     if count_job == len(jobIDs):
-                        jobs_per_page = jobs_per_page + 25
-                        count_job = 0
                         log.info("""****************************************\n\n
                         Going to next jobs page, YEAAAHHH!!
                         ****************************************\n\n""")
-                        self.avoid_lock()
-                        self.browser, jobs_per_page = self.next_jobs_page(position,
-                                                                        location,
-                                                                        jobs_per_page)
+                        if not finish_page():
+                            turn_over = True
+                            break
+                if turn_over:
+                    break
+            except CircuitOpen as e:
+                log.error("Ending this turn: %s", e)
+                break
+            except ApplyAborted:
+                raise
             except Exception as e:
-                print(e)
+                # the reloaded page skips claimed jobs, so hand back the ones not handled yet
+                self.appliedJobIDs.release(unhandled)
+                unhandled = []
+                try:
+                    self.supervisor.handle(e, f"results page {jobs_per_page}")
+                    # start the page over, from a fresh load if the browser was replaced
+                    reloaded, _ = self.supervisor.call("results page", self.next_jobs_page, position, location,
+                                                       jobs_per_page)
+                except CircuitOpen as e:
+                    log.error("Ending this turn: %s", e)
+                    break
+                if not reloaded:
+                    break
 
-    def write_to_file(self, button, jobID, browserTitle, result) -> None:
-        def re_extract(text, pattern):
-            target = re.search(pattern, text)
-            if target:
-                target = target.group(1)
-            return target
+        # a turn ended mid-page, leave its jobs to the next visit
+        self.appliedJobIDs.release(unhandled)
+        set_context(jobID=None)
+        if self.prefetcher:
+            self.prefetcher.discard()
+        stats.seconds = time.time() - start_time
+        return stats
+
+    def apply_to_job(self, jobID, position_number) -> bool:
+        """Open one job and apply if it qualifies; True when an application was sent off."""
+        self.get_job_page(jobID)
+
+        # get easy apply button
+        button = self.get_easy_apply_button()
+        # card titles can be cut short, the page title is the full one; read it once per job
+        job, company = parse_title(self.browser.title)
+        # word filter to skip positions not wanted
+        attempted: bool = False
+
+        if button is not False:
+            rejected: str | None = self.job_filter.reject(job, company)
+            fingerprint: Fingerprint | None = self.job_fingerprint(job, company) if not rejected else None
+            duplicate: int | None = self.fingerprints.find(fingerprint) if fingerprint else None
+            if rejected:
+                log.info("skipping this application: %s", rejected)
+                string_easy = rejected
+                result = False
+            elif duplicate is not None:
+                log.info("skipping this application, it is a repost of %s", duplicate)
+                string_easy = f"* Repost of {duplicate}"
+                result = f"duplicate of {duplicate}"
+                # recorded as not attempted
+                button = False
+            else:
+                string_easy = "* has Easy Apply Button"
+                log.info("Clicking the EASY apply button")
+                self.throttle()
+                button.click()
+                self.pause('apply_click')
+                # self.fill_out_phone_number()
+                result: bool = self.send_resume()
+                if result and fingerprint:
+                    self.fingerprints.add(jobID, fingerprint)
+                attempted = True
+        else:
+            log.info("The button does not exist.")
+            string_easy = "* Doesn't have Easy Apply Button"
+            result = False
+
+        log.info("Position %s: %s | %s %s", position_number, job, company, string_easy)
+
+        self.write_to_file(button, jobID, (job, company), result)
+        return attempted
+
+    @timed('filter')
+    def filter_cards(self, cards: list) -> list:
+        """jobIDs of the cards that pass the job filter; the rest are recorded as skipped."""
+        passed: list = []
+        for card in cards:
+            reason: str | None = self.job_filter.reject(card.title, card.company, card.location)
+            if reason is None:
+                passed.append(card.jobID)
+            elif self.appliedJobIDs.claim(card.jobID):
+                log.info("Skipping %s %s at %s without opening it: %s", card.jobID, card.title, card.company, reason,
+                         extra={'jobID': card.jobID})
+                self.write_to_file(False, card.jobID, f"{card.title} | {card.company}", False)
+        return passed
+
+    @timed('prescreen')
+    def prescreen(self, jobIDs) -> list:
+        self.prescreener.update_session(self.browser.get_cookies(),
+                                        self.browser.execute_script("return navigator.userAgent;"))
+        passed: list = []
+        for result in self.prescreener.screen(jobIDs):
+            if result.passed:
+                passed.append(result.jobID)
+            else:
+                log.info("Skipping %s %s without opening it: %s", result.jobID, result.title, result.reason,
+                         extra={'jobID': result.jobID})
+                self.write_to_file(False, result.jobID, result.title, False)
+        log.info("%d of %d jobs passed prescreening", len(passed), len(jobIDs))
+        return passed
+
+    def job_fingerprint(self, job, company) -> Fingerprint | None:
+        if self.fingerprints is None:
+            return None
+        return self.fingerprints.fingerprint(job, company, description_text(self.job_page))
 
+    def results_exhausted(self, jobs_per_page) -> bool:
+        if self.prefetcher and self.prefetcher.exhausted(jobs_per_page):
+            log.info("No more results after %d jobs, ending this search", jobs_per_page)
+            self.prefetcher.discard()
+            return True
+        return False
+
+    def write_to_file(self, button, jobID, browserTitle, result) -> None:
         timestamp: str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         attempted: bool = False if button == False else True
-        job = re_extract(browserTitle.split(' | ')[0], r"\(?\d?\)?\s?(\w.*)")
-        company = re_extract(browserTitle.split(' | ')[1], r"(\w.*)")
-
-        toWrite: list = [timestamp, jobID, job, company, attempted, result]
-        with open(self.filename, 'a') as f:
-            writer = csv.writer(f)
-            writer.writerow(toWrite)
-
+        # a page title, or the (job, company) it was already parsed into
+        job, company = browserTitle if isinstance(browserTitle, tuple) else parse_title(browserTitle)
+
+        self.results.write({'timestamp': timestamp,
+                            'jobID': jobID,
+                            'job': job,
+                            'company': company,
+                            'attempted': attempted,
+                            'result': result,
+                            'combo': self.combo_label})
+        self.appliedJobIDs.add(jobID, timestamp)
+
+    @timed('job_page')
     def get_job_page(self, jobID):
 
         job: str = 'https://www.linkedin.com/jobs/view/' + str(jobID)
+        if self.job_page is not None:
+            self.job_page.release()
+        self.throttle()
         self.browser.get(job)
-        self.job_page = self.load_page(sleep=0.5)
+        self.job_page = self.load_page(until='apply')
         return self.job_page
 
+    @timed('apply_button')
     def get_easy_apply_button(self):
         try:
             button = self.browser.find_elements(By.XPATH,
                 '//button[contains(@class, "jobs-apply-button")]'
             )
-            print('buttons found: ', button)
+            log.debug("buttons found: %s", button)
             EasyApplyButton =  button[1] if len(button) > 1 else button[0] if len(button) > 0 else False
             # EasyApplyButton = button[0]
             
         except Exception as e: 
-            print("Exception:",e)
+            log.debug("Could not look up the apply button: %s", e)
             EasyApplyButton = False
 
         return EasyApplyButton
@@ -351,9 +636,9 @@ class EasyApplyBot:
 
         if input_field:
             input_field.clear()
-            print(f"fill phone number: {self.phone_number}")
+            log.debug("fill phone number: %s", self.phone_number)
             input_field.send_keys(self.phone_number)
-            time.sleep(random.uniform(4.5, 6.5))
+            self.pause('upload')
         
 
 
@@ -376,7 +661,7 @@ class EasyApplyBot:
                         break
             if button:
                 button.click()
-                time.sleep(random.uniform(1.5, 2.5))
+                self.pause('step')
                 # if i in (3, 4):
                 #     submitted = True
                 # if i != 2:
@@ -385,252 +670,143 @@ class EasyApplyBot:
 
 
         else:
-            log.debug(f"Could not find phone number field")
+            log.debug("Could not find phone number field")
                 
 
 
+    @timed('send_resume')
     def send_resume(self) -> bool:
-        def is_present(button_locator) -> bool:
-            return len(self.browser.find_elements(button_locator[0],
-                                                  button_locator[1])) > 0
-
-        try:
-            time.sleep(random.uniform(1.5, 2.5))
-            
-            questions_heading_locator = (By.XPATH, "//form//h3[contains(text(), 'Additional Questions')]")
-            
-            work_authorization_heading_locator = (By.XPATH, "//form//h3[contains(text(), 'Work authorization')]")
-            
-            next_locater = (By.CSS_SELECTOR,
-                            "button[aria-label='Continue to next step']")
-            review_locater = (By.CSS_SELECTOR,
-                              "button[aria-label='Review your application']")
-            submit_locater = (By.CSS_SELECTOR,
-                              "button[aria-label='Submit application']")
-            submit_application_locator = (By.CSS_SELECTOR,
-                                          "button[aria-label='Submit application']")
-            error_locator = (By.CSS_SELECTOR,
-                             "p[data-test-form-element-error-message='true']")
-            upload_locator = upload_locator = (By.XPATH, "//*[contains(@aria-label, 'DOC, DOCX, PDF formats are supported. Max file size is (2 MB)')]")
-            follow_locator = (By.CSS_SELECTOR, "label[for='follow-company-checkbox']")
+        self.pause('step')
+        modal = EasyApplyModal(self.browser, self.apply_max_steps)
+        step_start: float = time.perf_counter()
 
-            submitted = False
-            while True:
-                log.info(f"upload locator is present: {is_present(upload_locator)}")
-
-                if is_present(upload_locator):
-
-                    input_buttons = self.browser.find_elements(upload_locator[0],
-                                                               upload_locator[1])
-                    
-                    log.info(f"input_buttons: {input_buttons}")
-                    for input_button in input_buttons:
-                        descendant_input = input_button.find_element(By.XPATH, "../..//input")
-                        log.info(f"descendant_input: {descendant_input}")
-                        for key in self.uploads.keys():
-                            if key.lower() in descendant_input.get_attribute('id').lower():
-                                descendant_input.send_keys(self.uploads[key])
-
-                    time.sleep(random.uniform(4.5, 6.5))
-
-                self.answer_questions()
-
-                # Click Next or submit button if possible
-                button: None = None
-                buttons: list = [next_locater, review_locater, follow_locator,
-                           submit_locater, submit_application_locator]
-                for i, button_locator in enumerate(buttons):
-
-                
-                    if is_present(button_locator):
-                        button: None = self.wait.until(EC.element_to_be_clickable(button_locator))
-
-                    if is_present(error_locator):
-                        for element in self.browser.find_elements(error_locator[0],
-                                                                  error_locator[1]):
-                            text = element.text
-                            if "Please enter a valid answer" in text:
-                                button = None
-                                break
-                    if button:
-                        
-                        print(f"button found: {buttons[i]}")
-
-                        button.click()
-                        print(f"Clicked button {buttons[i]}")
-
-                        time.sleep(random.uniform(1.5, 2.5))
-                        if i in (3, 4):
-                            submitted = True
-                        if i != 2:
-                            print(f"break at {buttons[i]}")
-                            break
-                if button == None:
-                    log.info("Could not complete submission")
-                    break
-                elif submitted:
-                    log.info("Application Submitted")
-                    break
-
-                time.sleep(random.uniform(1.5, 2.5))
+        def pause() -> None:
+            nonlocal step_start
+            self.metrics.observe('send_resume_step', time.perf_counter() - step_start, self.combo_label)
+            self.pause('step')
+            self.throttle()
+            step_start = time.perf_counter()
 
+        try:
+            outcome: ApplyOutcome = modal.run(self.upload_files, self.answer_questions, pause)
         except Exception as e:
-            log.info(e)
-            log.info("cannot apply to this job")
+            log.info("cannot apply to this job: %s", e)
+            self.answer_cache.discard()
             raise (e)
 
-        return submitted
-    
+        if outcome.submitted:
+            log.info("Application Submitted after %d steps", outcome.steps)
+            self.answer_cache.commit()
+        else:
+            log.warning("Could not complete submission: %s", outcome.reason)
+            self.answer_cache.discard()
+        return outcome.submitted
+
+    @timed('upload')
+    def upload_files(self, step: ModalStep) -> None:
+        for upload in step.uploads:
+            field_id: str = upload.get('id', '').lower()
+            for key, path in self.uploads.items():
+                if key.lower() in field_id or key.lower().replace(' ', '-') in field_id:
+                    log.debug("uploading %s to %s", path, field_id)
+                    upload['input'].send_keys(path)
+                    break
+        self.pause('upload')
+
+    @timed('answer_questions')
     def answer_questions(self):
-        time.sleep(random.uniform(1.5, 2.5))
+        start: float = time.monotonic()
+        try:
+            questions: list = read_form(self.browser)
+        except Exception as e:
+            log.error("Error reading questions: %s", e)
+            return
+        log.debug("Found %d questions", len(questions))
 
-        questions = self.browser.find_elements(By.XPATH, "//*[contains(@class, 'jobs-easy-apply-form-element')]")
-        log.info(f"Found {len(questions)} questions")
-        
+        answers: list = []
         for question in questions:
-            try:
-                label = question.find_element(By.XPATH, ".//label")
-                log.info(f"Answering question: {label.text}")
-
-                input_element = question.find_element(By.XPATH, f".//*[@id='{label.get_attribute('for')}']")
-                log.info(f"Input type: {input_element.get_attribute('type')}")
-
-                answer_provided = False
-
-                if input_element.tag_name == "select":
-                    options = input_element.find_elements(By.TAG_NAME, "option")
-                    yes_selected = False
-                    for option in options:
-                        if "yes" in option.text.lower():
-                            option.click()
-                            yes_selected = True
-                            break
-                    if not yes_selected and options:
-                        options[-1].click()  # Select the final option if 'yes' is not available
-                elif input_element.tag_name == "input" and input_element.get_attribute("type") == "radio":
-                    radio_buttons = question.find_elements(By.XPATH, ".//input[@type='radio']")
-                    yes_selected = False
-                    for radio_button in radio_buttons:
-                        if radio_button.get_attribute("value").lower() == "yes":
-                            label = radio_button.find_element(By.XPATH, "./following-sibling::label")
-                            label.click()
-                            yes_selected = True
-                            break
-                    if not yes_selected and radio_buttons:
-                        final_radio_button = radio_buttons[-1]
-                        final_label = final_radio_button.find_element(By.XPATH, "./following-sibling::label")
-                        final_label.click()  # Select the final option if 'yes' is not available
-                        
-                elif "first name" in label.text.lower():
-                    answer = self.first_name
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                elif "last name" in label.text.lower():
-                    answer = self.last_name
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                elif "address" in label.text.lower():
-                    answer = self.address
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                elif "city" in label.text.lower():
-                    answer = self.city
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                elif "state" in label.text.lower():
-                    answer = self.state
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                elif "zip" in label.text.lower():
-                    answer = self.zipcode
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                elif "country" in label.text.lower():
-                    answer= self.country
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                elif "mobile phone number" in label.text.lower() or "primary phone number" in label.text.lower():
-                    answer = self.phone_number
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                elif "years" in label.text.lower() or "how long" in label.text.lower():
-                    answer = self.experience            
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                elif "salary" in label.text.lower():
-                    answer = self.salary
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                
-                elif "how did you hear about" in label.text.lower():
-                    answer = "LinkedIn"
-                    print(f"asnwer: {answer}")
-                    input_element.clear()
-                    input_element.send_keys(answer)
-                    answer_provided = True
-                else:
-                    log.info(f"Skipping question: {label.text}")
-
-                if answer_provided:
-                    time.sleep(random.uniform(2.0, 4.5))
-                    
-            except Exception as e:
-                log.error(f"Error processing question: {str(e)}")
+            answer, rule = self.choose_answer(question)
+            if answer is None:
+                log.info("Skipping question: %s", question.label)
                 continue
+            log.debug("Answering question: %s (%s)", question.label, question.kind)
+            answers.append((question, answer))
+            self.answer_cache.remember(question, answer, rule)
 
-
-    def load_page(self, sleep=1):
-        scroll_page = 0
-        while scroll_page < 4000:
-            self.browser.execute_script("window.scrollTo(0," + str(scroll_page) + " );")
-            scroll_page += 200
-            time.sleep(sleep)
-
-        if sleep != 1:
-            self.browser.execute_script("window.scrollTo(0,0);")
-            time.sleep(sleep * 3)
-
-        page = BeautifulSoup(self.browser.page_source, "lxml")
-        return page
+        try:
+            filled: list = fill_form(self.browser, answers)
+        except Exception as e:
+            log.error("Error filling questions: %s", e)
+            filled = []
+
+        if answers:
+            self.pause('answer')
+        log.info("Answered %d of %d questions in %.2fs",
+                 sum(1 for ok in filled if ok), len(questions), time.monotonic() - start)
+
+    def choose_answer(self, question: FormQuestion) -> tuple:
+        # answers that already got an application through win over the rules
+        answer, rule = self.answer_cache.lookup(question, self.question_matcher)
+        if answer is None:
+            answer, rule = self.question_matcher.match(question)
+        return answer, rule
+
+    @timed('load_page')
+    def load_page(self, until='quiet') -> LazyPage:
+        elapsed: float = self.readiness.wait(until)
+        self.pacer.observe_page(elapsed, self.readiness.last_ready, self.readiness.last_state)
+        if self.lean:
+            self.lean.report(self.browser)
+        # parsed piecemeal on demand, the full page_source is never pulled over
+        return LazyPage(self.browser)
 
     def avoid_lock(self) -> None:
+        # imported here: pyautogui needs a display as soon as it is imported
+        try:
+            import pyautogui
+        except Exception as e:
+            log.debug(f"Skipping lock avoidance, pyautogui is unavailable: {e}")
+            return
         x, _ = pyautogui.position()
         pyautogui.moveTo(x + 200, pyautogui.position().y, duration=1.0)
         pyautogui.moveTo(x, pyautogui.position().y, duration=0.5)
         pyautogui.keyDown('ctrl')
         pyautogui.press('esc')
         pyautogui.keyUp('ctrl')
-        time.sleep(0.5)
+        self.sleep(0.5)
         pyautogui.press('esc')
 
+    def search_url(self, position, location, jobs_per_page) -> str:
+        return ("https://www.linkedin.com/jobs/search/?f_LF=f_AL&keywords=" +
+                position + location + "&start=" + str(jobs_per_page))
+
+    @timed('search_page')
     def next_jobs_page(self, position, location, jobs_per_page):
-        self.browser.get(
-            "https://www.linkedin.com/jobs/search/?f_LF=f_AL&keywords=" +
-            position + location + "&start=" + str(jobs_per_page))
+        if self.prefetcher and self.prefetcher.take(jobs_per_page):
+            log.info("Using prefetched results page at offset %d", jobs_per_page)
+        else:
+            if self.prefetcher:
+                self.prefetcher.discard()
+            self.throttle()
+            self.browser.get(self.search_url(position, location, jobs_per_page))
         self.avoid_lock()
-        log.info("Lock avoided.")
-        self.load_page()
+        log.debug("Lock avoided.")
+        self.load_page(until='cards')
         return (self.browser, jobs_per_page)
 
     def finish_apply(self) -> None:
-        self.browser.close()
\ No newline at end of file
+        if self.session_store:
+            # LinkedIn rotates some cookies during a run, keep the latest ones
+            try:
+                self.session_store.save(self.browser.get_cookies())
+            except Exception as e:
+                log.debug("Could not save the session: %s", e)
+        self.browser.close()
+        if self.prescreener:
+            self.prescreener.close()
+        if self.owns_results:
+            self.results.close()
+        if self.owns_fingerprints and self.fingerprints:
+            self.fingerprints.close()
+        if self.owns_store:
+            self.appliedJobIDs.close()
\ No newline at end of file
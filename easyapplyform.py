@@ -0,0 +1,122 @@
+from __future__ import annotations
+import logging
+from dataclasses import dataclass, field
+
+log = logging.getLogger(__name__)
+
+# Describes every question of the current Easy Apply step in one round trip.
+# Each input gets a data-easy-apply-ref attribute so the fill script can find it again.
+FORM_SNAPSHOT_SCRIPT = """
+function labelFor(input) {
+    var label = input.id ? document.querySelector('label[for="' + CSS.escape(input.id) + '"]') : null;
+    return label ? label.innerText.trim() : (input.value || '');
+}
+var questions = [];
+var ref = 0;
+document.querySelectorAll('.jobs-easy-apply-form-element').forEach(function (element) {
+    var heading = element.querySelector('legend, label');
+    var question = {label: heading ? heading.innerText.trim().split('\\n')[0] : '',
+                    kind: null, ref: null, value: null, options: []};
+    var radios = element.querySelectorAll('input[type="radio"]');
+    if (radios.length) {
+        question.kind = 'radio';
+        radios.forEach(function (radio) {
+            radio.setAttribute('data-easy-apply-ref', String(ref));
+            question.options.push({text: labelFor(radio), value: radio.value, ref: String(ref++)});
+            if (radio.checked) { question.value = radio.value; }
+        });
+    } else {
+        var target = heading && heading.getAttribute('for') ? document.getElementById(heading.getAttribute('for')) : null;
+        var input = target || element.querySelector('select, textarea, input');
+        if (!input) { return; }
+        input.setAttribute('data-easy-apply-ref', String(ref));
+        question.ref = String(ref++);
+        question.kind = input.tagName === 'SELECT' ? 'select'
+                      : input.tagName === 'TEXTAREA' ? 'textarea'
+                      : (input.getAttribute('type') || 'text');
+        question.value = input.type === 'checkbox' ? input.checked : input.value;
+        if (input.tagName === 'SELECT') {
+            Array.prototype.forEach.call(input.options, function (option) {
+                question.options.push({text: option.text.trim(), value: option.value, ref: null});
+            });
+        }
+    }
+    questions.push(question);
+});
+return questions;
+"""
+
+# Applies all answers of a step in one round trip. Text goes through the native
+# value setter plus input/change events so the page's framework picks it up.
+FORM_FILL_SCRIPT = """
+var results = [];
+arguments[0].forEach(function (answer) {
+    var input = document.querySelector('[data-easy-apply-ref="' + answer.ref + '"]');
+    if (!input) { results.push(false); return; }
+    if (answer.kind === 'radio' || answer.kind === 'checkbox') {
+        var label = input.id ? document.querySelector('label[for="' + CSS.escape(input.id) + '"]') : null;
+        if (!input.checked) { (label || input).click(); }
+    } else {
+        var proto = input.tagName === 'SELECT' ? HTMLSelectElement.prototype
+                  : input.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+                  : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(input, answer.value);
+        input.dispatchEvent(new Event('input', {bubbles: true}));
+        input.dispatchEvent(new Event('change', {bubbles: true}));
+        input.dispatchEvent(new Event('blur'));
+    }
+    results.push(true);
+});
+return results;
+"""
+
+
+@dataclass
+class FormOption:
+    text: str
+    value: str
+    ref: str | None = None
+
+
+@dataclass
+class FormQuestion:
+    label: str
+    kind: str
+    ref: str | None = None
+    value: object = None
+    options: list = field(default_factory=list)
+
+    @property
+    def has_options(self) -> bool:
+        return self.kind in ('radio', 'select')
+
+
+def read_form(browser) -> list:
+    records: list = browser.execute_script(FORM_SNAPSHOT_SCRIPT) or []
+    return [FormQuestion(label=record.get('label') or '',
+                         kind=record.get('kind'),
+                         ref=record.get('ref'),
+                         value=record.get('value'),
+                         options=[FormOption(**option) for option in record.get('options') or []])
+            for record in records]
+
+
+def fill_form(browser, answers: list) -> list:
+    """Fill (question, answer) pairs in one script call.
+
+    `answer` is a FormOption for radio and select questions, True for a
+    checkbox, and the text to enter for everything else.
+    """
+    payload: list = []
+    for question, answer in answers:
+        if question.kind == 'radio':
+            payload.append({'kind': 'radio', 'ref': answer.ref})
+        elif question.kind == 'select':
+            payload.append({'kind': 'select', 'ref': question.ref, 'value': answer.value})
+        elif question.kind == 'checkbox':
+            payload.append({'kind': 'checkbox', 'ref': question.ref})
+        else:
+            payload.append({'kind': question.kind, 'ref': question.ref, 'value': str(answer)})
+    if not payload:
+        return []
+    return browser.execute_script(FORM_FILL_SCRIPT, payload) or []
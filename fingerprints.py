@@ -0,0 +1,153 @@
+from __future__ import annotations
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+log = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+BITS = 64
+# job description containers, logged-in page first
+DESCRIPTION_SELECTORS: str = '.jobs-description__content, #job-details, .show-more-less-html__markup, .description__text'
+
+_words = re.compile(r"[a-z0-9]+")
+# title decorations that change between reposts of the same role
+_title_noise = re.compile(r"\((?:remote|hybrid|on-?site|contract|full[- ]time|part[- ]time|m/f/d|f/m/d|w/m/d)\)|"
+                          r"\b(?:remote|hybrid|urgent|hiring|immediate(?:ly)?)\b")
+
+
+def normalize(text: str | None) -> str:
+    if not text:
+        return ''
+    return ' '.join(_words.findall(_title_noise.sub(' ', text.lower())))
+
+
+def _hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text: str | None, shingle: int = 3) -> int | None:
+    """64 bit SimHash over word shingles; similar texts differ in few bits."""
+    words: list = _words.findall((text or '').lower())
+    if len(words) < shingle:
+        return None
+    weights: list = [0] * BITS
+    for i in range(len(words) - shingle + 1):
+        h: int = _hash(' '.join(words[i:i + shingle]))
+        for bit in range(BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(BITS) if weights[bit] > 0)
+
+
+def description_text(page) -> str | None:
+    """Description text of a job page (a LazyPage), None if the page has none."""
+    if page is None:
+        return None
+    return page.text(DESCRIPTION_SELECTORS)
+
+
+def _signed(value: int) -> int:
+    # SQLite integers are signed 64 bit
+    return value - (1 << BITS) if value >= 1 << (BITS - 1) else value
+
+
+@dataclass
+class Fingerprint:
+    key: str
+    simhash: int
+
+
+class FingerprintIndex:
+    """Persistent index of postings the bot applied to, to spot reposts.
+
+    A posting is keyed by its normalized title and company, so the same role
+    under a new jobID or in another location gets the same key, and carries
+    a SimHash of its description. A new posting is a duplicate when an
+    indexed one with the same key is within `max_distance` bits. The hash is
+    split into max_distance + 1 bands, any two hashes that close agree on at
+    least one band, so lookups are a handful of indexed queries instead of a
+    scan.
+    """
+
+    def __init__(self, path: str = 'fingerprints.db', max_distance: int = 6, retention_days: float | None = 30) -> None:
+        self.path = path
+        self.max_distance = max_distance
+        self.bands: int = max_distance + 1
+        self.band_bits: int = BITS // self.bands
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS postings (
+                jobID INTEGER PRIMARY KEY,
+                key TEXT NOT NULL,
+                simhash INTEGER NOT NULL,
+                timestamp TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS postings_timestamp ON postings (timestamp);
+            CREATE TABLE IF NOT EXISTS bands (
+                key TEXT NOT NULL,
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                jobID INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS bands_lookup ON bands (key, band, value);
+            CREATE INDEX IF NOT EXISTS bands_job ON bands (jobID);
+        """)
+        if retention_days is not None:
+            self.prune((datetime.now() - timedelta(days=retention_days)).strftime(TIMESTAMP_FORMAT))
+        self.conn.commit()
+
+    def fingerprint(self, title: str | None, company: str | None, description: str | None) -> Fingerprint | None:
+        """None when there is not enough to go on, such postings are never called duplicates."""
+        key: str = f"{normalize(title)}|{normalize(company)}"
+        value: int | None = simhash(description)
+        if value is None or key.startswith('|') or key.endswith('|'):
+            return None
+        return Fingerprint(key, value)
+
+    def band_values(self, value: int) -> list:
+        mask: int = (1 << self.band_bits) - 1
+        return [(band, value >> band * self.band_bits & mask) for band in range(self.bands)]
+
+    def find(self, fp: Fingerprint | None) -> int | None:
+        """jobID of an indexed near duplicate of `fp`, if there is one."""
+        if fp is None:
+            return None
+        with self._lock:
+            for band, value in self.band_values(fp.simhash):
+                rows = self.conn.execute("""
+                    SELECT postings.jobID, postings.simhash FROM bands
+                    JOIN postings ON postings.jobID = bands.jobID
+                    WHERE bands.key = ? AND bands.band = ? AND bands.value = ?
+                """, (fp.key, band, value)).fetchall()
+                for jobID, other in rows:
+                    if bin((other % (1 << BITS)) ^ fp.simhash).count('1') <= self.max_distance:
+                        return jobID
+        return None
+
+    def add(self, jobID, fp: Fingerprint | None, timestamp: str | None = None) -> None:
+        if fp is None:
+            return
+        timestamp = timestamp or datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self._lock:
+            self.conn.execute("DELETE FROM bands WHERE jobID = ?", (int(jobID),))
+            self.conn.execute("INSERT OR REPLACE INTO postings (jobID, key, simhash, timestamp) VALUES (?, ?, ?, ?)",
+                              (int(jobID), fp.key, _signed(fp.simhash), timestamp))
+            self.conn.executemany("INSERT INTO bands (key, band, value, jobID) VALUES (?, ?, ?, ?)",
+                                  [(fp.key, band, value, int(jobID)) for band, value in self.band_values(fp.simhash)])
+            self.conn.commit()
+
+    def prune(self, cutoff: str) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM bands WHERE jobID IN (SELECT jobID FROM postings WHERE timestamp < ?)",
+                              (cutoff,))
+            self.conn.execute("DELETE FROM postings WHERE timestamp < ?", (cutoff,))
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+import logging
+from dataclasses import dataclass
+
+log = logging.getLogger(__name__)
+
+# Reads every job card on a search results page in a single round trip.
+# LinkedIn renames these classes now and then, so each field tries a few selectors.
+JOB_CARDS_SCRIPT = """
+function text(card, selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+        var el = card.querySelector(selectors[i]);
+        if (el && el.innerText.trim()) {
+            return el.innerText.trim().split('\\n')[0];
+        }
+    }
+    return null;
+}
+var records = [];
+document.querySelectorAll('div[data-job-id]').forEach(function (card) {
+    var footer = card.querySelector('.job-card-container__footer-wrapper, .job-card-list__footer-wrapper');
+    var footerText = footer ? footer.innerText : null;
+    records.push({
+        jobID: card.getAttribute('data-job-id'),
+        title: text(card, ['.job-card-list__title', 'a.job-card-container__link', '.artdeco-entity-lockup__title']),
+        company: text(card, ['.job-card-container__primary-description', '.job-card-container__company-name',
+                             '.artdeco-entity-lockup__subtitle']),
+        location: text(card, ['.job-card-container__metadata-item', '.artdeco-entity-lockup__caption']),
+        easyApply: footerText === null ? null : /easy apply/i.test(footerText),
+        applied: footerText !== null && /\\bapplied\\b/i.test(footerText)
+    });
+});
+return records;
+"""
+
+
+@dataclass
+class JobCard:
+    jobID: int
+    title: str | None = None
+    company: str | None = None
+    location: str | None = None
+    # None when the card footer was not rendered, so we can't tell
+    easyApply: bool | None = None
+    applied: bool = False
+
+
+def extract_job_cards(browser) -> list:
+    records: list = browser.execute_script(JOB_CARDS_SCRIPT) or []
+    cards: list = []
+    for record in records:
+        try:
+            # data-job-id is sometimes an urn like "urn:li:fs_normalized_jobPosting:123"
+            jobID = int(str(record.get('jobID')).split(':')[-1])
+        except ValueError:
+            log.debug("Skipping job card with unexpected id %r", record.get('jobID'))
+            continue
+        cards.append(JobCard(jobID=jobID,
+                             title=record.get('title'),
+                             company=record.get('company'),
+                             location=record.get('location'),
+                             easyApply=record.get('easyApply'),
+                             applied=bool(record.get('applied'))))
+    return cards
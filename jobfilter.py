@@ -0,0 +1,114 @@
+from __future__ import annotations
+import logging
+import re
+
+log = logging.getLogger(__name__)
+
+REGEX_PREFIX = 're:'
+FIELDS: tuple = ('title', 'company', 'location')
+
+_words = re.compile(r"\w+(?:[+#]+|\.\w+)*")
+
+
+def words(text: str | None) -> list:
+    """Lowercased words; keeps C++, C#, .NET style tokens together."""
+    return _words.findall(text.lower()) if text else []
+
+
+class TermMatcher:
+    """A list of terms compiled into one matcher.
+
+    Plain terms match as whole words or phrases, ignoring case, and are
+    looked up by word n-gram in a set, so the cost per text does not grow
+    with the number of terms. Terms starting with 're:' are regexes; all of
+    them are combined into a single case-insensitive pattern.
+    """
+
+    def __init__(self, terms: list | None = None) -> None:
+        self.phrases: dict = {}
+        patterns: list = []
+        for term in terms or []:
+            if term is None:
+                continue
+            term = str(term)
+            if term.startswith(REGEX_PREFIX):
+                pattern: str = term[len(REGEX_PREFIX):]
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid filter regex {pattern!r}: {e}") from e
+                patterns.append(f"(?:{pattern})")
+            elif words(term):
+                self.phrases[tuple(words(term))] = term
+        self.lengths: list = sorted({len(phrase) for phrase in self.phrases})
+        self.regex = re.compile('|'.join(patterns), re.IGNORECASE) if patterns else None
+
+    def __bool__(self) -> bool:
+        return bool(self.phrases) or self.regex is not None
+
+    def search(self, text: str | None) -> str | None:
+        """The term that matches `text`, None if none does."""
+        if not text:
+            return None
+        if self.phrases:
+            tokens: list = words(text)
+            for i in range(len(tokens)):
+                for n in self.lengths:
+                    if i + n > len(tokens):
+                        break
+                    term: str | None = self.phrases.get(tuple(tokens[i:i + n]))
+                    if term is not None:
+                        return term
+        if self.regex is not None:
+            match = self.regex.search(text)
+            if match:
+                return match.group(0)
+        return None
+
+
+class JobFilter:
+    """Block and allow rules for job titles, companies and locations.
+
+    Built once from config.yaml:
+
+        blacklist: [Acme]              # companies to skip
+        blackListTitles: [Senior]      # title words to skip
+        filters:
+          title:    {block: [...], allow: [...]}
+          company:  {block: [...], allow: [...]}
+          location: {block: [...], allow: [...]}
+
+    A job is rejected when a field matches a block term, or when the field
+    has an allow list and matches none of it. Unknown fields (None) are
+    never rejected, the job page is checked again once it is open.
+    """
+
+    def __init__(self, blacklist: list | None = None, blackListTitles: list | None = None,
+                 rules: dict | None = None) -> None:
+        rules = rules or {}
+        unknown: set = set(rules) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown filter fields {sorted(unknown)}, expected {', '.join(FIELDS)}")
+        extra_block: dict = {'title': blackListTitles or [], 'company': blacklist or []}
+        self.block: dict = {}
+        self.allow: dict = {}
+        for field in FIELDS:
+            rule: dict = rules.get(field) or {}
+            self.block[field] = TermMatcher(list(extra_block.get(field, [])) + list(rule.get('block') or []))
+            self.allow[field] = TermMatcher(rule.get('allow'))
+
+    def check(self, field: str, value: str | None) -> str | None:
+        if not value:
+            return None
+        term: str | None = self.block[field].search(value)
+        if term is not None:
+            return f"* Blacklisted {field} ({term})"
+        if self.allow[field] and self.allow[field].search(value) is None:
+            return f"* {field.capitalize()} not in allow list"
+        return None
+
+    def reject(self, title: str | None = None, company: str | None = None, location: str | None = None) -> str | None:
+        """Why the job should be skipped, or None to keep it."""
+        return (self.check('title', title)
+                or self.check('company', company)
+                or self.check('location', location))
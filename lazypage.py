@@ -0,0 +1,64 @@
+from __future__ import annotations
+import logging
+
+try:
+    import lxml.html
+    HAVE_LXML: bool = True
+except ImportError:
+    HAVE_LXML = False
+
+log = logging.getLogger(__name__)
+
+# outerHTML of the first element matching a selector list, or null
+FRAGMENT_SCRIPT: str = """
+const node = document.querySelector(arguments[0]);
+return node ? node.outerHTML : null;
+"""
+
+
+def parse_fragment(markup: str):
+    """Parse an HTML fragment with lxml when it is installed, html.parser otherwise."""
+    if HAVE_LXML:
+        return lxml.html.fragment_fromstring(markup, create_parent='div')
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(markup, 'html.parser')
+
+
+def fragment_text(fragment) -> str:
+    text: str = fragment.text_content() if HAVE_LXML else fragment.get_text(' ')
+    return ' '.join(text.split())
+
+
+class LazyPage:
+    """The page the browser currently shows, parsed only where it is asked about.
+
+    Nothing is transferred or parsed until `html`, `fragment` or `text` is
+    called, and then only the outerHTML of the first element matching the
+    selectors comes over from the browser, instead of the whole
+    page_source. Results are cached until the next page load replaces this
+    object, or `release` drops them.
+    """
+
+    def __init__(self, browser) -> None:
+        self.browser = browser
+        self._html: dict = {}
+        self._fragments: dict = {}
+
+    def html(self, selectors: str) -> str | None:
+        if selectors not in self._html:
+            self._html[selectors] = self.browser.execute_script(FRAGMENT_SCRIPT, selectors)
+        return self._html[selectors]
+
+    def fragment(self, selectors: str):
+        if selectors not in self._fragments:
+            markup: str | None = self.html(selectors)
+            self._fragments[selectors] = parse_fragment(markup) if markup else None
+        return self._fragments[selectors]
+
+    def text(self, selectors: str) -> str | None:
+        fragment = self.fragment(selectors)
+        return fragment_text(fragment) if fragment is not None else None
+
+    def release(self) -> None:
+        self._html.clear()
+        self._fragments.clear()
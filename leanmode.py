@@ -0,0 +1,93 @@
+from __future__ import annotations
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+# The bot only reads text and clicks a handful of buttons, so none of these are needed.
+# Network.setBlockedURLs only takes URL patterns, so resource types map to patterns.
+RESOURCE_TYPE_PATTERNS: dict = {
+    'image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*', '*media.licdn.com/dms/image*'],
+    'font': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*'],
+    'media': ['*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*', '*dms.licdn.com/playlist*'],
+}
+
+DEFAULT_BLOCKED_PATTERNS: list = [
+    '*doubleclick.net*',
+    '*googletagmanager.com*',
+    '*google-analytics.com*',
+    '*px.ads.linkedin.com*',
+    '*snap.licdn.com*',
+    '*linkedin.com/li/track*',
+]
+
+
+class LeanMode:
+    """Keeps LinkedIn pages light: blocks resource types and URL patterns through
+    the DevTools protocol, turns off images and prefetching in the profile and
+    reports per page how many requests were blocked and how many bytes loaded.
+    """
+
+    def __init__(self, block_types: list | None = None, block_patterns: list | None = None,
+                 report: bool = True) -> None:
+        self.block_types: list = list(block_types) if block_types is not None else list(RESOURCE_TYPE_PATTERNS)
+        self.patterns: list = list(block_patterns) if block_patterns is not None else list(DEFAULT_BLOCKED_PATTERNS)
+        for resource_type in self.block_types:
+            if resource_type not in RESOURCE_TYPE_PATTERNS:
+                raise ValueError(f"Unknown resource type {resource_type!r}, expected one of {list(RESOURCE_TYPE_PATTERNS)}")
+            self.patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        self.report_pages: bool = report
+        self.totals: dict = {'pages': 0, 'requests': 0, 'blocked': 0, 'bytes': 0}
+
+    def apply_options(self, options) -> None:
+        prefs: dict = {
+            # 2 = block
+            'profile.managed_default_content_settings.images': 2 if 'image' in self.block_types else 1,
+            'net.network_prediction_options': 2,
+        }
+        options.add_experimental_option('prefs', prefs)
+        options.add_argument("--dns-prefetch-disable")
+        options.add_argument("--disable-features=Prefetch,NoStatePrefetch,PreloadMediaEngagementData")
+        if 'image' in self.block_types:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+        if self.report_pages:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def attach(self, driver) -> None:
+        if not hasattr(driver, 'execute_cdp_cmd'):
+            log.info("Lean mode needs a Chrome driver, request blocking is off")
+            return
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+        log.info("Lean mode on, blocking %d URL patterns", len(self.patterns))
+
+    def report(self, driver) -> dict | None:
+        if not self.report_pages or not hasattr(driver, 'get_log'):
+            return None
+        try:
+            entries: list = driver.get_log('performance')
+        except Exception as e:
+            log.debug("Performance log unavailable: %s", e)
+            return None
+
+        page: dict = {'requests': 0, 'blocked': 0, 'bytes': 0}
+        for entry in entries:
+            try:
+                message: dict = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method: str = message.get('method', '')
+            params: dict = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                page['requests'] += 1
+            elif method == 'Network.loadingFinished':
+                page['bytes'] += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                page['blocked'] += 1
+
+        self.totals['pages'] += 1
+        for key in page:
+            self.totals[key] += page[key]
+        log.info("Page weight: %.0f KiB over %d requests, %d requests blocked",
+                 page['bytes'] / 1024, page['requests'], page['blocked'])
+        return page
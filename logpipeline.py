@@ -0,0 +1,148 @@
+from __future__ import annotations
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+# record attributes that are stamped from the calling thread's context
+CONTEXT_FIELDS: tuple = ('jobID', 'combo', 'phase')
+
+_context = threading.local()
+_listener: logging.handlers.QueueListener | None = None
+
+
+def set_context(**fields) -> None:
+    """Set jobID / combo / phase for every record logged from this thread."""
+    for name, value in fields.items():
+        setattr(_context, name, value)
+
+
+@contextmanager
+def log_context(**fields):
+    previous: dict = {name: getattr(_context, name, None) for name in fields}
+    set_context(**fields)
+    try:
+        yield
+    finally:
+        set_context(**previous)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the thread's log context onto the record before it is queued.
+
+    Fields passed with `extra=` win over the context.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name in CONTEXT_FIELDS:
+            if not hasattr(record, name):
+                setattr(record, name, getattr(_context, name, None))
+        return True
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler renders the message in the calling thread so the record
+    can be pickled; the queue here never leaves the process, so the apply loop
+    only pays for creating the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict = {'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created))
+                               + f".{int(record.msecs):03d}",
+                       'level': record.levelname,
+                       'logger': record.name,
+                       'thread': record.threadName,
+                       'message': record.getMessage()}
+        for name in CONTEXT_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__('%(asctime)s - %(levelname)s - %(message)s', '%H:%M:%S')
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        text: str = super().formatMessage(record)
+        job = getattr(record, 'jobID', None)
+        return f"{text} [job {job}]" if job is not None else text
+
+
+def _level(value) -> int:
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value).upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level {value!r}")
+    return level
+
+
+def setup_logging(level='INFO', console_level=None, log_dir: str | None = './logs',
+                  levels: dict | None = None) -> logging.handlers.QueueListener:
+    """Route all logging through a queue to a background writer thread.
+
+    Records are written as JSON Lines to a timestamped file in `log_dir`
+    and as plain text to the console. `level` is the root level,
+    `console_level` can make the console quieter than the file and
+    `levels` sets per logger levels, e.g. {'selenium': 'WARNING'}.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    handlers: list = []
+    console = logging.StreamHandler()
+    console.setLevel(_level(console_level or level))
+    console.setFormatter(ConsoleFormatter())
+    handlers.append(console)
+
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        stamp: str = time.strftime('%m_%d_%y %H_%M_%S')
+        file_handler = logging.FileHandler(os.path.join(log_dir, f"{stamp} applyJobs.jsonl"), encoding='utf-8')
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = LazyQueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(_level(level))
+    for name, value in (levels or {}).items():
+        logging.getLogger(name).setLevel(_level(value))
+
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Drain the queue and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
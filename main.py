@@ -1,11 +1,17 @@
 from __future__ import annotations
+import argparse
 import logging
 import yaml
-from EasyApplyBot import EasyApplyBot
+from easyapplybot import EasyApplyBot
+from logpipeline import setup_logging
 
 log = logging.getLogger(__name__)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Apply to LinkedIn Easy Apply jobs")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue the search from the last checkpoint instead of starting over")
+    args = parser.parse_args()
 
     with open("config.yaml", 'r') as stream:
         try:
@@ -13,6 +19,11 @@ if __name__ == '__main__':
         except yaml.YAMLError as exc:
             raise exc
 
+    setup_logging(parameters.get('log_level', 'INFO'),
+                  console_level=parameters.get('console_log_level'),
+                  log_dir=parameters.get('log_dir', './logs'),
+                  levels=parameters.get('log_levels'))
+
     assert len(parameters['positions']) > 0
     assert len(parameters['locations']) > 0
     assert parameters['username'] is not None
@@ -39,12 +50,34 @@ if __name__ == '__main__':
     output_filename: list = output_filename[0] if len(output_filename) > 0 else 'output.csv'
     blacklist = parameters.get('blacklist', [])
     blackListTitles = parameters.get('blackListTitles', [])
+    applied_store = parameters.get('applied_store', 'applied_jobs.db')
+    retention_days = parameters.get('retention_days', 2)
+    output_format = parameters.get('output_format', 'csv')
+    output_flush_rows = parameters.get('output_flush_rows', 20)
+    output_flush_seconds = parameters.get('output_flush_seconds', 30)
+    page_max_wait = parameters.get('page_max_wait', 10)
+    question_rules = parameters.get('question_rules')
+    answer_cache = parameters.get('answer_cache', 'answers.json')
+
+    # only the combo_* keys that are set, ComboScheduler has defaults for the rest
+    scheduler_keys: dict = {'combo_strategy': 'strategy',
+                            'combo_time_budget': 'time_budget',
+                            'combo_page_budget': 'page_budget',
+                            'combo_max_pages': 'max_pages',
+                            'combo_idle_turns': 'idle_turns',
+                            'combo_stats': 'stats_file'}
+    scheduler_settings: dict = {arg: parameters[key] for key, arg in scheduler_keys.items() if key in parameters}
+    pacing_keys: dict = {'pace_actions_per_minute': 'per_minute',
+                         'pace_actions_per_hour': 'per_hour',
+                         'pace_scale': 'scale',
+                         'pace_slow_seconds': 'slow_seconds'}
+    pacing_settings: dict = {arg: parameters[key] for key, arg in pacing_keys.items() if key in parameters}
 
     uploads = {} if parameters.get('uploads', {}) == None else parameters.get('uploads', {})
     for key in uploads.keys():
         assert uploads[key] != None
 
-    bot = EasyApplyBot(parameters['username'],
+    bot_args: tuple = (parameters['username'],
                        parameters['password'],
                        parameters['first_name'],
                        parameters['last_name'],
@@ -55,13 +88,69 @@ if __name__ == '__main__':
                        parameters['state'],
                        parameters['zipcode'],
                        parameters['country'],
-                       parameters['phone_number'],
-                       uploads=uploads,
-                       filename=output_filename,
-                       blacklist=blacklist,
-                       blackListTitles=blackListTitles
-                       )
+                       parameters['phone_number'])
+    bot_kwargs: dict = dict(uploads=uploads,
+                            filename=output_filename,
+                            blacklist=blacklist,
+                            blackListTitles=blackListTitles,
+                            applied_store=applied_store,
+                            retention_days=retention_days,
+                            output_format=output_format,
+                            output_flush_rows=output_flush_rows,
+                            output_flush_seconds=output_flush_seconds,
+                            page_max_wait=page_max_wait,
+                            question_rules=question_rules,
+                            answer_cache=answer_cache,
+                            headless=parameters.get('headless', False),
+                            lean_mode=parameters.get('lean_mode', False),
+                            lean_block_types=parameters.get('lean_block_types'),
+                            lean_block_patterns=parameters.get('lean_block_patterns'),
+                            # recordings are replayed in a single tab
+                            prefetch=parameters.get('prefetch', True) and
+                            parameters.get('browser_backend', 'live') == 'live',
+                            # stubbed and replayed runs must not reach LinkedIn over HTTP either
+                            prescreen=parameters.get('prescreen', False) and
+                            parameters.get('browser_backend', 'live') in ('live', 'record'),
+                            prescreen_concurrency=parameters.get('prescreen_concurrency', 4),
+                            scheduler_settings=scheduler_settings,
+                            checkpoint=parameters.get('checkpoint', 'checkpoint.json'),
+                            resume=args.resume,
+                            metrics_json=parameters.get('metrics_json', 'metrics.json'),
+                            metrics_prometheus=parameters.get('metrics_prometheus'),
+                            fingerprint_index=parameters.get('fingerprint_index', 'fingerprints.db'),
+                            fingerprint_distance=parameters.get('fingerprint_distance', 6),
+                            filters=parameters.get('filters'),
+                            apply_max_steps=parameters.get('apply_max_steps', 10),
+                            pacing_settings=pacing_settings,
+                            job_retries=parameters.get('job_retries', 2),
+                            breaker_threshold=parameters.get('breaker_threshold', 5),
+                            breaker_cooldown=parameters.get('breaker_cooldown', 300),
+                            session_dir=parameters.get('session_dir', './sessions'))
 
     locations: list = [l for l in parameters['locations'] if l != None]
     positions: list = [p for p in parameters['positions'] if p != None]
-    bot.start_apply(positions, locations)
+
+    workers: int = parameters.get('workers', 1) or 1
+    if workers > 1:
+        from workers import ApplyWorkerPool
+        pool = ApplyWorkerPool(bot_args, bot_kwargs,
+                               concurrency=workers,
+                               profile_root=parameters.get('profile_root', './profiles'))
+        pool.run(positions, locations)
+    else:
+        from backends import open_backend
+        from browserfactory import create_driver
+        from leanmode import LeanMode
+        lean = LeanMode(bot_kwargs['lean_block_types'], bot_kwargs['lean_block_patterns']) \
+            if bot_kwargs['lean_mode'] else None
+        browser = open_backend(parameters.get('browser_backend', 'live'),
+                               parameters.get('recording_dir', './recordings'),
+                               parameters.get('replay_latency', 0.0),
+                               driver_factory=lambda: create_driver(EasyApplyBot.browser_options(lean),
+                                                                    headless=bot_kwargs['headless']))
+        bot = EasyApplyBot(*bot_args, browser=browser, **bot_kwargs)
+        try:
+            bot.start_apply(positions, locations)
+        finally:
+            # saves the refreshed session and closes the browser, like the pool does for its workers
+            bot.finish_apply()
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from logpipeline import log_context
+
+log = logging.getLogger(__name__)
+
+BUCKETS: tuple = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900, float('inf'))
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.counts: list = [0] * len(BUCKETS)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.min: float = float('inf')
+        self.max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation, capped at the max seen."""
+        if not self.count:
+            return 0.0
+        rank: float = q * self.count
+        seen: int = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {'count': self.count,
+                'sum': round(self.sum, 3),
+                'mean': round(self.sum / self.count, 3) if self.count else 0.0,
+                'min': round(self.min, 3) if self.count else 0.0,
+                'p50': round(self.quantile(0.5), 3),
+                'p90': round(self.quantile(0.9), 3),
+                'p99': round(self.quantile(0.99), 3),
+                'max': round(self.max, 3)}
+
+
+class Metrics:
+    """Duration histograms per (phase, combo), shareable between worker threads.
+
+    with metrics.timer('load_page', combo='Engineer|Remote'):
+        ...
+    """
+
+    def __init__(self, json_path: str | None = 'metrics.json', prometheus_path: str | None = None) -> None:
+        self.json_path = json_path
+        self.prometheus_path = prometheus_path
+        self.histograms: dict = {}
+        self.started: float = time.time()
+        self._lock = threading.Lock()
+
+    def observe(self, phase: str, seconds: float, combo: str | None = None) -> None:
+        key: tuple = (phase, combo or '')
+        with self._lock:
+            histogram: Histogram | None = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, phase: str, combo: str | None = None):
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start, combo)
+
+    def summary(self) -> dict:
+        with self._lock:
+            items: list = sorted(self.histograms.items())
+            phases: dict = {}
+            for (phase, combo), histogram in items:
+                phases.setdefault(phase, {})[combo or 'all'] = histogram.summary()
+            totals: dict = {}
+            for (phase, _), histogram in items:
+                total: Histogram = totals.setdefault(phase, Histogram())
+                for i, count in enumerate(histogram.counts):
+                    total.counts[i] += count
+                total.count += histogram.count
+                total.sum += histogram.sum
+                total.min = min(total.min, histogram.min)
+                total.max = max(total.max, histogram.max)
+        return {'started': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started)),
+                'elapsed': round(time.time() - self.started, 3),
+                'phases': {phase: dict(by_combo, total=totals[phase].summary()) for phase, by_combo in phases.items()}}
+
+    def prometheus(self) -> str:
+        lines: list = ['# HELP easyapplybot_phase_seconds Time spent per bot phase',
+                       '# TYPE easyapplybot_phase_seconds histogram']
+        with self._lock:
+            for (phase, combo), histogram in sorted(self.histograms.items()):
+                labels: str = f'phase="{_escape(phase)}",combo="{_escape(combo)}"'
+                cumulative: int = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    le: str = '+Inf' if bound == float('inf') else repr(float(bound))
+                    lines.append(f'easyapplybot_phase_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f'easyapplybot_phase_seconds_sum{{{labels}}} {histogram.sum:.6f}')
+                lines.append(f'easyapplybot_phase_seconds_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self) -> None:
+        try:
+            if self.json_path:
+                _write_atomic(self.json_path, json.dumps(self.summary(), indent=1))
+            if self.prometheus_path:
+                _write_atomic(self.prometheus_path, self.prometheus())
+        except OSError as e:
+            log.info(f"Could not write metrics: {e}")
+
+
+def timed(phase: str):
+    """Decorator timing a method of an object with `metrics` and `combo_label` attributes.
+
+    Records logged inside the method carry `phase` as well.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.timer(phase, self.combo_label), log_context(phase=phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(path: str, text: str) -> None:
+    temp: str = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp, path)
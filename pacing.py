@@ -0,0 +1,97 @@
+from __future__ import annotations
+import logging
+import random
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# base pause ranges in seconds, scaled by Pacer.scale and the current pressure
+PAUSES: dict = {
+    'page': (3.5, 4.9),       # after a results page settled, before reading it
+    'apply_click': (2.5, 3.5),  # after clicking Easy Apply, for the modal to open
+    'step': (1.5, 2.5),       # between Easy Apply steps
+    'upload': (4.5, 6.5),     # after attaching files
+    'answer': (1.0, 2.0),     # after filling a form step
+}
+
+
+class TokenBucket:
+    """Reservation style token bucket: a reservation may drive the balance
+    negative, the caller then sleeps for the returned time. Not locked, the
+    Pacer serialises access."""
+
+    def __init__(self, per_second: float, capacity: float) -> None:
+        self.per_second = per_second
+        self.capacity = capacity
+        self.tokens: float = capacity
+        self.updated: float = time.monotonic()
+
+    def reserve(self, rate_factor: float = 1.0) -> float:
+        now: float = time.monotonic()
+        rate: float = self.per_second * rate_factor
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        self.tokens -= 1
+        return -self.tokens / rate if self.tokens < 0 else 0.0
+
+
+class Pacer:
+    """Paces the bot against a target action rate, adapting to how LinkedIn responds.
+
+    Navigations and form clicks are actions; `reserve` hands out the wait
+    that keeps them within `per_minute` and `per_hour`. `delay` gives the
+    human-looking pause for a kind of step. Both stretch with `pressure`,
+    which grows on slow pages, error banners and challenge pages and
+    decays while pages come back healthy. Pressure below 1 only shortens
+    pauses, the action rate never goes above the configured target.
+    Shared by all workers of a pool, since they use the same account.
+    """
+
+    def __init__(self, per_minute: float = 12, per_hour: float = 400, scale: float = 1.0,
+                 slow_seconds: float = 6.0, min_pressure: float = 0.5, max_pressure: float = 8.0,
+                 error_cooldown: float = 60, challenge_cooldown: float = 600) -> None:
+        self.minute = TokenBucket(per_minute / 60, max(1.0, per_minute / 4))
+        self.hour = TokenBucket(per_hour / 3600, max(1.0, per_hour / 20))
+        self.scale = scale
+        self.slow_seconds = slow_seconds
+        self.min_pressure = min_pressure
+        self.max_pressure = max_pressure
+        self.error_cooldown = error_cooldown
+        self.challenge_cooldown = challenge_cooldown
+        self.pressure: float = 1.0
+        self.cooldown_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Seconds to wait before the next action."""
+        with self._lock:
+            factor: float = 1 / max(1.0, self.pressure)
+            wait: float = max(self.minute.reserve(factor), self.hour.reserve(factor))
+            return max(wait, self.cooldown_until - time.monotonic())
+
+    def delay(self, kind: str) -> float:
+        low, high = PAUSES[kind]
+        return random.uniform(low, high) * self.scale * self.pressure
+
+    def adjust(self, factor: float, reason: str | None = None, cooldown: float = 0.0) -> None:
+        with self._lock:
+            previous: float = self.pressure
+            self.pressure = min(self.max_pressure, max(self.min_pressure, self.pressure * factor))
+            if cooldown:
+                self.cooldown_until = max(self.cooldown_until, time.monotonic() + cooldown)
+        if reason:
+            log.warning("Slowing down (%s): pressure %.2f -> %.2f%s", reason, previous, self.pressure,
+                        f", pausing {cooldown:.0f}s" if cooldown else "")
+
+    def observe_page(self, seconds: float, ready: bool = True, state: dict | None = None) -> None:
+        """Feed back how a page load went."""
+        state = state or {}
+        if state.get('challenge'):
+            self.adjust(self.max_pressure, 'challenge page', self.challenge_cooldown)
+        elif state.get('errorBanner'):
+            self.adjust(2.0, 'error banner', self.error_cooldown)
+        elif not ready or seconds > self.slow_seconds:
+            self.adjust(1.25, f"slow page, {seconds:.1f}s")
+        else:
+            self.adjust(0.95)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+# One round trip per poll: installs a MutationObserver on first use (it is gone
+# again after every navigation), nudges lazy-loaded job cards into view and
+# reports what the page looks like right now.
+PROBE_SCRIPT = """
+if (!window.__easyApplyObserver) {
+    window.__easyApplyLastMutation = performance.now();
+    window.__easyApplyObserver = new MutationObserver(function () {
+        window.__easyApplyLastMutation = performance.now();
+    });
+    window.__easyApplyObserver.observe(document.documentElement, {childList: true, subtree: true});
+}
+var cards = document.querySelectorAll('[data-job-id]');
+if (arguments[0] && cards.length) {
+    cards[cards.length - 1].scrollIntoView({block: 'end'});
+}
+return {
+    readyState: document.readyState,
+    cards: cards.length,
+    applyButton: document.querySelectorAll('button.jobs-apply-button').length > 0,
+    quietFor: performance.now() - window.__easyApplyLastMutation,
+    challenge: /\/checkpoint\/challenge|\/authwall/.test(location.pathname) ||
+        document.querySelector('iframe[src*="captcha"], #captcha-internal') !== null,
+    errorBanner: document.querySelector('.artdeco-toast-item--error, .error-container') !== null
+};
+"""
+
+
+class PageReadiness:
+    """Waits for a page to be usable instead of sleeping for a fixed time.
+
+    until='cards'  - search results: the job card count stopped growing
+    until='apply'  - job page: the apply button showed up, or the DOM went quiet without one
+    until='quiet'  - anything else: no DOM mutations for `quiet_period` seconds
+    """
+
+    def __init__(self, browser, max_wait: float = 10, poll: float = 0.25, quiet_period: float = 0.75) -> None:
+        self.browser = browser
+        self.max_wait = max_wait
+        self.poll = poll
+        self.quiet_period = quiet_period
+        self.last_elapsed: float = 0.0
+        self.last_ready: bool = True
+        self.last_state: dict = {}
+
+    def is_ready(self, until: str, state: dict, previous: dict | None) -> bool:
+        if state.get('readyState') == 'loading':
+            return False
+        quiet: bool = state.get('quietFor', 0) >= self.quiet_period * 1000
+        if until == 'cards':
+            stable: bool = previous is not None and previous.get('cards') == state.get('cards')
+            return state.get('cards', 0) > 0 and stable and quiet
+        if until == 'apply':
+            return state.get('applyButton', False) or quiet
+        return quiet
+
+    def wait(self, until: str = 'quiet') -> float:
+        start: float = time.monotonic()
+        previous: dict | None = None
+        ready: bool = False
+        while True:
+            try:
+                state: dict = self.browser.execute_script(PROBE_SCRIPT, until == 'cards') or {}
+            except Exception as e:
+                # the page may still be swapping documents right after a click or get()
+                log.debug("Readiness probe failed: %s", e)
+                state = {}
+            ready = bool(state) and self.is_ready(until, state, previous)
+            elapsed: float = time.monotonic() - start
+            if ready or elapsed >= self.max_wait:
+                break
+            previous = state
+            time.sleep(self.poll)
+
+        self.last_elapsed = elapsed
+        self.last_ready = ready
+        self.last_state = state
+        if ready:
+            log.info("Page ready (%s) after %.2fs", until, elapsed)
+        else:
+            log.info("Page not ready (%s) after max wait of %ss, continuing", until, self.max_wait)
+        return elapsed
@@ -0,0 +1,89 @@
+from __future__ import annotations
+import logging
+import time
+
+from jobcards import extract_job_cards
+from pageready import PROBE_SCRIPT, PageReadiness
+
+log = logging.getLogger(__name__)
+
+
+class ResultsPrefetcher:
+    """Loads the next search results page in a background tab.
+
+    `start` opens the tab and returns immediately; the page loads while the
+    bot applies to jobs in the main tab. `poll`, called between jobs, briefly
+    switches to the tab to nudge lazy-loaded cards and, once the list is
+    stable, reads the cards. `take` turns the tab into the main tab at the
+    page boundary.
+    """
+
+    def __init__(self, browser, readiness: PageReadiness) -> None:
+        self.browser = browser
+        self.readiness = readiness
+        self.handle: str | None = None
+        self.offset: int | None = None
+        self.cards: list | None = None
+        self.started: float = 0.0
+        self._state: dict | None = None
+
+    def start(self, url: str, offset: int) -> None:
+        if self.handle is not None and self.offset == offset:
+            return
+        self.discard()
+        before: set = set(self.browser.window_handles)
+        self.browser.execute_script("window.open(arguments[0], '_blank');", url)
+        opened: list = [handle for handle in self.browser.window_handles if handle not in before]
+        if not opened:
+            log.info("Could not open a tab to prefetch the next results page")
+            return
+        self.handle, self.offset, self.cards, self._state = opened[0], offset, None, None
+        self.started = time.monotonic()
+        log.debug("Prefetching results from offset %d", offset)
+
+    def poll(self) -> None:
+        if self.handle is None or self.cards is not None:
+            return
+        main: str = self.browser.current_window_handle
+        try:
+            self.browser.switch_to.window(self.handle)
+            state: dict = self.browser.execute_script(PROBE_SCRIPT, True) or {}
+            if self.readiness.is_ready('cards', state, self._state):
+                self.cards = extract_job_cards(self.browser)
+                log.info("Prefetched %d job cards from offset %d", len(self.cards), self.offset)
+            elif state.get('cards', 0) == 0 and state.get('readyState') == 'complete' \
+                    and state.get('quietFor', 0) >= 2000 \
+                    and time.monotonic() - self.started >= self.readiness.max_wait:
+                # a settled page without cards: the search has no more results
+                self.cards = []
+                log.info("No results at offset %d, stopping prefetch", self.offset)
+            self._state = state
+        except Exception as e:
+            log.debug("Prefetch poll failed: %s", e)
+        finally:
+            self.browser.switch_to.window(main)
+
+    def exhausted(self, offset: int) -> bool:
+        return self.offset == offset and self.cards is not None and len(self.cards) == 0
+
+    def take(self, offset: int) -> bool:
+        """Make the prefetched tab the main tab if it holds `offset`."""
+        if self.handle is None or self.offset != offset:
+            return False
+        self.browser.close()
+        self.browser.switch_to.window(self.handle)
+        self.handle = None
+        return True
+
+    def discard(self) -> None:
+        if self.handle is None:
+            return
+        main: str = self.browser.current_window_handle
+        try:
+            self.browser.switch_to.window(self.handle)
+            self.browser.close()
+        except Exception as e:
+            log.debug("Could not close prefetch tab: %s", e)
+        finally:
+            self.browser.switch_to.window(main)
+            self.handle, self.offset, self.cards = None, None, None
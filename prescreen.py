@@ -0,0 +1,116 @@
+from __future__ import annotations
+import html
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from jobfilter import JobFilter
+from pacing import Pacer
+from resultsink import parse_title
+
+log = logging.getLogger(__name__)
+
+_title = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+# logged-in job pages embed the apply method in their JSON payload, guest pages only the button text
+_easy_apply = re.compile(r"ComplexOnsiteApply|SimpleOnsiteApply|jobs-apply-button[^>]*>\s*(?:<[^>]+>\s*)*Easy Apply",
+                         re.IGNORECASE)
+_offsite_apply = re.compile(r"OffsiteApply", re.IGNORECASE)
+
+
+@dataclass
+class PrescreenResult:
+    jobID: int
+    title: str | None = None
+    job: str | None = None
+    company: str | None = None
+    # None when the page could not be fetched or did not say
+    easyApply: bool | None = None
+    reason: str | None = None
+
+    @property
+    def passed(self) -> bool:
+        return self.reason is None
+
+
+def parse_job_page(jobID: int, body: str) -> PrescreenResult:
+    match = _title.search(body)
+    title: str | None = html.unescape(match.group(1)).strip() if match else None
+    job, company = parse_title(title)
+    if _easy_apply.search(body):
+        easyApply: bool | None = True
+    elif _offsite_apply.search(body):
+        easyApply = False
+    else:
+        easyApply = None
+    return PrescreenResult(jobID=jobID, title=title, job=job, company=company, easyApply=easyApply)
+
+
+class JobPrescreener:
+    """Fetches job pages over plain HTTP, reusing the browser's session cookies,
+    so jobs that are not Easy Apply or are rejected by the job filter never cost a
+    browser page load. Anything that can't be decided over HTTP is passed on
+    to the browser. Every fetch waits for a token from `pacer` first, the
+    same one that paces the browser, so the parallel fetches stay within
+    the account's action rate.
+    """
+
+    def __init__(self, job_filter: JobFilter | None = None, concurrency: int = 4, timeout: float = 10,
+                 base_url: str = 'https://www.linkedin.com', pacer: Pacer | None = None) -> None:
+        self.job_filter: JobFilter = job_filter or JobFilter()
+        self.pacer = pacer
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='prescreen')
+
+    def update_session(self, cookies: list, user_agent: str | None = None) -> None:
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        # logged-in API style requests need the csrf token mirrored from JSESSIONID
+        jsessionid = self.session.cookies.get('JSESSIONID')
+        if jsessionid:
+            self.session.headers['csrf-token'] = jsessionid.strip('"')
+
+    def fetch(self, jobID: int) -> PrescreenResult:
+        if self.pacer:
+            wait: float = self.pacer.reserve()
+            if wait > 0:
+                time.sleep(wait)
+        try:
+            response = self.session.get(f"{self.base_url}/jobs/view/{jobID}", timeout=self.timeout)
+        except requests.RequestException as e:
+            log.debug("Prescreen of %s failed: %s", jobID, e)
+            return PrescreenResult(jobID=jobID)
+        if response.status_code != 200:
+            log.debug("Prescreen of %s returned HTTP %d", jobID, response.status_code)
+            # 999 is how LinkedIn turns away requests it thinks are automated
+            if self.pacer and response.status_code in (429, 999):
+                self.pacer.adjust(2.0, f"prescreen got HTTP {response.status_code}", self.pacer.error_cooldown)
+            return PrescreenResult(jobID=jobID)
+
+        result: PrescreenResult = parse_job_page(jobID, response.text)
+        if result.easyApply is False:
+            result.reason = "* Doesn't have Easy Apply Button"
+        else:
+            result.reason = self.job_filter.reject(result.job, result.company)
+        return result
+
+    def screen(self, jobIDs: list) -> list:
+        """PrescreenResults for `jobIDs`, in the same order."""
+        return list(self.executor.map(self.fetch, jobIDs))
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+import atexit
+import csv
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+log = logging.getLogger(__name__)
+
+# new columns only ever go at the end, older CSV files have fewer of them
+FIELDS: list = ['timestamp', 'jobID', 'job', 'company', 'attempted', 'result', 'combo']
+
+_notification_count = re.compile(r"^\s*\(\d+\+?\)\s*")
+_leading_junk = re.compile(r"^\W+")
+
+
+def parse_title(browserTitle) -> tuple:
+    """Split a job page title ("(2) Engineer | Acme | LinkedIn") into (job, company).
+
+    Missing parts come back as None instead of raising.
+    """
+    if not browserTitle:
+        return None, None
+    parts: list = str(browserTitle).split(' | ')
+    job = _leading_junk.sub('', _notification_count.sub('', parts[0])).strip() or None
+    company = (_leading_junk.sub('', parts[1]).strip() or None) if len(parts) > 1 else None
+    return job, company
+
+
+class ResultSink:
+    def write_rows(self, rows: list) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class CsvSink(ResultSink):
+    # no header row, to stay compatible with the files written so far
+    def __init__(self, filename) -> None:
+        self.filename = filename
+
+    def write_rows(self, rows: list) -> None:
+        with open(self.filename, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerows([[row.get(k) for k in FIELDS] for row in rows])
+
+
+class JsonlSink(ResultSink):
+    def __init__(self, filename) -> None:
+        self.filename = filename
+
+    def write_rows(self, rows: list) -> None:
+        with open(self.filename, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(row) + '\n' for row in rows)
+
+
+class SqliteSink(ResultSink):
+    def __init__(self, filename) -> None:
+        self.filename = filename
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                timestamp TEXT, jobID INTEGER, job TEXT, company TEXT, attempted INTEGER, result INTEGER, combo TEXT
+            )
+        """)
+        columns: set = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        for name in FIELDS:
+            if name not in columns:
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {name} TEXT")
+        self.conn.commit()
+
+    def write_rows(self, rows: list) -> None:
+        self.conn.executemany(f"INSERT INTO results ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                              [[row.get(k) for k in FIELDS] for row in rows])
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+SINKS: dict = {
+    'csv': CsvSink,
+    'jsonl': JsonlSink,
+    'sqlite': SqliteSink,
+}
+
+
+class BufferedResultWriter:
+    """Batches result rows in memory and hands them to a sink from a background thread.
+
+    Every row is appended to a small local journal first, so rows that were
+    buffered but not yet flushed when the process died are written on the
+    next start.
+    """
+
+    def __init__(self, sink: ResultSink, journal: str = 'output.journal',
+                 flush_rows: int = 20, flush_seconds: float = 30) -> None:
+        self.sink = sink
+        self.journal = journal
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.buffer: list = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+
+        self.recover()
+        self._journal_file = open(self.journal, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name='result-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def recover(self) -> None:
+        if not os.path.isfile(self.journal):
+            return
+        rows: list = []
+        with open(self.journal, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    # torn final line from a crash mid-write
+                    continue
+        if rows:
+            log.info(f"Recovering {len(rows)} unflushed results from {self.journal}")
+            self.sink.write_rows(rows)
+        os.remove(self.journal)
+
+    def write(self, row: dict) -> None:
+        with self._lock:
+            self._journal_file.write(json.dumps(row) + '\n')
+            self._journal_file.flush()
+            self.buffer.append(row)
+            if len(self.buffer) >= self.flush_rows:
+                self._wake.set()
+
+    def flush(self) -> None:
+        with self._lock:
+            rows, self.buffer = self.buffer, []
+        if not rows:
+            return
+        # the sink write happens outside the lock so a slow output path never blocks write()
+        try:
+            self.sink.write_rows(rows)
+        except Exception as e:
+            log.error(f"Could not write {len(rows)} results, keeping them buffered: {e}")
+            with self._lock:
+                self.buffer = rows + self.buffer
+            return
+        with self._lock:
+            # keep only the rows that arrived while the sink was writing
+            self._journal_file.seek(0)
+            self._journal_file.truncate()
+            self._journal_file.writelines(json.dumps(row) + '\n' for row in self.buffer)
+            self._journal_file.flush()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._journal_file.close()
+        if not self.buffer and os.path.isfile(self.journal):
+            os.remove(self.journal)
+        self.sink.close()
+
+
+def open_result_writer(filename, output_format: str = 'csv', journal: str | None = None,
+                       flush_rows: int = 20, flush_seconds: float = 30) -> BufferedResultWriter:
+    if output_format not in SINKS:
+        raise ValueError(f"Unknown output_format {output_format!r}, expected one of {list(SINKS)}")
+    sink = SINKS[output_format](filename)
+    journal = journal or filename + '.journal'
+    return BufferedResultWriter(sink, journal, flush_rows, flush_seconds)
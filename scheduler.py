@@ -0,0 +1,208 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import random
+import threading
+from dataclasses import asdict, dataclass, field
+
+from checkpoint import Checkpoint
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Combo:
+    position: str
+    location: str
+    # where the next turn picks the search results up
+    offset: int = 0
+    turns: int = 0
+    pages: int = 0
+    applications: int = 0
+    seconds: float = 0.0
+    idle_turns: int = 0
+    retired: str | None = None
+    running: bool = False
+    last_turn: int = -1
+    # jobIDs of the current page that were not handled yet
+    inflight: list = field(default_factory=list)
+    # was running when the last checkpoint was written
+    interrupted: bool = False
+
+    @property
+    def key(self) -> str:
+        return f"{self.position}|{self.location}"
+
+
+@dataclass
+class TurnStats:
+    applications: int = 0
+    pages: int = 0
+    offset: int = 0
+    seconds: float = 0.0
+    exhausted: bool = False
+
+
+class ComboScheduler:
+    """Hands out (position, location) combos in turns with a time and page budget each.
+
+    strategy='round_robin' rotates through the combos that are still active;
+    strategy='yield' picks the combo with the best applications per minute,
+    counting what earlier runs saw (kept in `stats_file`), and tries unseen
+    combos first. A combo is retired once its results run out, after
+    `idle_turns` turns without a new application, or when it used up
+    `max_pages` pages or `max_seconds` in total.
+    """
+
+    def __init__(self, positions: list, locations: list, strategy: str = 'yield',
+                 time_budget: float = 30 * 60, page_budget: int = 5, max_pages: int = 40,
+                 max_seconds: float = 10 * 60 * 60, idle_turns: int = 2,
+                 stats_file: str | None = 'combo_stats.json', checkpoint: Checkpoint | None = None) -> None:
+        if strategy not in ('yield', 'round_robin'):
+            raise ValueError(f"Unknown combo strategy {strategy!r}, expected yield or round_robin")
+        self.strategy = strategy
+        self.time_budget = time_budget
+        self.page_budget = page_budget
+        self.max_pages = max_pages
+        self.max_seconds = max_seconds
+        self.idle_turns = idle_turns
+        self.stats_file = stats_file
+        self.checkpoint = checkpoint
+        self.history: dict = self.load_history()
+        self.turn: int = 0
+        self._cond = threading.Condition()
+
+        combos: list = [Combo(position, location) for position in positions for location in locations]
+        random.shuffle(combos)
+        self.combos: list = combos
+
+    def load_history(self) -> dict:
+        if not self.stats_file or not os.path.isfile(self.stats_file):
+            return {}
+        try:
+            with open(self.stats_file, encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError as e:
+            log.info(f"Combo stats {self.stats_file} could not be read: {e}")
+            return {}
+
+    def save_history(self) -> None:
+        if not self.stats_file:
+            return
+        temp: str = self.stats_file + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.history, f, indent=1, sort_keys=True)
+        os.replace(temp, self.stats_file)
+
+    def yield_rate(self, combo: Combo) -> float:
+        past: dict = self.history.get(combo.key, {})
+        applications: float = past.get('applications', 0) + combo.applications
+        minutes: float = (past.get('seconds', 0) + combo.seconds) / 60
+        if minutes == 0:
+            return float('inf')
+        return applications / minutes
+
+    def active(self) -> list:
+        return [combo for combo in self.combos if combo.retired is None]
+
+    def pick(self) -> Combo | None:
+        candidates: list = [combo for combo in self.active() if not combo.running]
+        if not candidates:
+            return None
+        interrupted: list = [combo for combo in candidates if combo.interrupted]
+        if interrupted:
+            return interrupted[0]
+        if self.strategy == 'round_robin':
+            return min(candidates, key=lambda combo: combo.last_turn)
+        return max(candidates, key=lambda combo: (self.yield_rate(combo), -combo.last_turn))
+
+    def next(self) -> Combo | None:
+        """The next combo to run, or None when every combo is retired.
+
+        Blocks while all active combos are being run by other workers.
+        """
+        with self._cond:
+            while True:
+                combo: Combo | None = self.pick()
+                if combo is not None:
+                    combo.running = True
+                    combo.interrupted = False
+                    combo.last_turn = self.turn
+                    self.turn += 1
+                    self.save_checkpoint(force=True)
+                    return combo
+                if not self.active():
+                    return None
+                self._cond.wait()
+
+    def report(self, combo: Combo, stats: TurnStats) -> None:
+        with self._cond:
+            combo.running = False
+            combo.turns += 1
+            combo.offset = stats.offset
+            combo.pages += stats.pages
+            combo.applications += stats.applications
+            combo.seconds += stats.seconds
+            combo.idle_turns = 0 if stats.applications else combo.idle_turns + 1
+            combo.inflight = []
+
+            if stats.exhausted:
+                combo.retired = 'no more results'
+            elif combo.idle_turns >= self.idle_turns:
+                combo.retired = f"no new applications in {combo.idle_turns} turns"
+            elif combo.pages >= self.max_pages:
+                combo.retired = f"page limit of {self.max_pages} reached"
+            elif combo.seconds >= self.max_seconds:
+                combo.retired = 'time limit reached'
+
+            past: dict = self.history.setdefault(combo.key, {'applications': 0, 'seconds': 0.0})
+            past['applications'] += stats.applications
+            past['seconds'] += stats.seconds
+            self.save_history()
+
+            log.info(f"{combo.position}: {combo.location} turn {combo.turns}: {stats.applications} applications, "
+                     f"{stats.pages} pages in {stats.seconds / 60:.1f} min"
+                     + (f", retired ({combo.retired})" if combo.retired else ""))
+            self.save_checkpoint(force=True)
+            self._cond.notify_all()
+
+    def progress(self, combo: Combo, offset: int | None = None, inflight: list | None = None) -> None:
+        """Record where a running turn is, so a restart can continue from there."""
+        with self._cond:
+            if offset is not None:
+                combo.offset = offset
+            if inflight is not None:
+                combo.inflight = list(inflight)
+            self.save_checkpoint()
+
+    def state(self) -> dict:
+        return {'turn': self.turn, 'combos': [asdict(combo) for combo in self.combos]}
+
+    def restore(self, state: dict) -> None:
+        saved: dict = {f"{combo['position']}|{combo['location']}": combo for combo in state.get('combos', [])}
+        for combo in self.combos:
+            previous: dict | None = saved.get(combo.key)
+            if previous is None:
+                continue
+            for name in ('offset', 'turns', 'pages', 'applications', 'seconds', 'idle_turns', 'retired',
+                         'last_turn', 'inflight'):
+                setattr(combo, name, previous.get(name, getattr(combo, name)))
+            combo.interrupted = bool(previous.get('running') or previous.get('interrupted'))
+            combo.running = False
+            if combo.interrupted:
+                log.info(f"Resuming {combo.position}: {combo.location} at result {combo.offset}"
+                         + (f", retrying {len(combo.inflight)} jobs that were in flight" if combo.inflight else ""))
+        self.turn = state.get('turn', self.turn)
+        log.info(f"Resumed from checkpoint: {len(self.active())} of {len(self.combos)} combos left")
+
+    def save_checkpoint(self, force: bool = False) -> None:
+        if self.checkpoint is None:
+            return
+        if not self.active():
+            self.checkpoint.clear()
+            return
+        try:
+            self.checkpoint.save(self.state(), force)
+        except OSError as e:
+            log.info(f"Could not write checkpoint {self.checkpoint.path}: {e}")
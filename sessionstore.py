@@ -0,0 +1,132 @@
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows, where only threads are kept apart
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+# smallest page on the domain, cookies can only be set for the page's own domain
+COOKIE_PAGE = 'https://www.linkedin.com/robots.txt'
+PROBE_URL = 'https://www.linkedin.com/voyager/api/me'
+# the cookie that carries the login
+AUTH_COOKIE = 'li_at'
+
+_locks: dict = {}
+_locks_lock = threading.Lock()
+
+
+def _thread_lock(path: str) -> threading.Lock:
+    with _locks_lock:
+        return _locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+class SessionStore:
+    """Saved LinkedIn cookies of one account, so a new browser can skip the login.
+
+    The jar is a JSON file per account (named after a hash of the username)
+    in `directory`, readable only by the owner. Reads and writes hold a
+    lock per file, between threads and, where fcntl exists, between
+    processes, so workers and scheduled runs can share it. Saved cookies
+    are only used after a probe request shows they are still logged in.
+    """
+
+    def __init__(self, account: str, directory: str = './sessions', timeout: float = 10) -> None:
+        self.account = account
+        self.directory = directory
+        self.timeout = timeout
+        digest: str = hashlib.sha256(account.strip().lower().encode('utf-8')).hexdigest()[:16]
+        self.path: str = os.path.join(directory, f"{digest}.json")
+
+    def _locked(self, action):
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        with _thread_lock(self.path):
+            with open(self.path + '.lock', 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    return action()
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self) -> list:
+        def read() -> list:
+            if not os.path.isfile(self.path):
+                return []
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    return json.load(f).get('cookies', [])
+            except (ValueError, AttributeError) as e:
+                log.info(f"Saved session {self.path} could not be read: {e}")
+                return []
+
+        now: float = time.time()
+        return [cookie for cookie in self._locked(read) if cookie.get('expiry', now + 1) > now]
+
+    def save(self, cookies: list) -> None:
+        def write() -> None:
+            temp: str = f"{self.path}.{threading.get_ident()}.tmp"
+            fd: int = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'cookies': cookies}, f)
+            os.replace(temp, self.path)
+
+        if any(cookie.get('name') == AUTH_COOKIE for cookie in cookies):
+            self._locked(write)
+
+    def clear(self) -> None:
+        def remove() -> None:
+            if os.path.isfile(self.path):
+                os.remove(self.path)
+
+        self._locked(remove)
+
+    def probe(self, cookies: list, user_agent: str | None = None) -> bool:
+        """True when the cookies are still logged in, checked with one small API request."""
+        if not any(cookie.get('name') == AUTH_COOKIE for cookie in cookies):
+            return False
+        jar: dict = {cookie['name']: cookie['value'] for cookie in cookies}
+        headers: dict = {'csrf-token': jar.get('JSESSIONID', '').strip('"'),
+                         'x-restli-protocol-version': '2.0.0'}
+        if user_agent:
+            headers['User-Agent'] = user_agent
+        try:
+            response = requests.get(PROBE_URL, cookies=jar, headers=headers, timeout=self.timeout,
+                                    allow_redirects=False)
+        except requests.RequestException as e:
+            log.info(f"Session probe failed: {e}")
+            return False
+        return response.status_code == 200
+
+    def restore(self, browser) -> bool:
+        """Load the saved session into `browser`; False when there is none or it expired."""
+        cookies: list = self.load()
+        if not cookies:
+            return False
+        try:
+            user_agent: str | None = browser.execute_script("return navigator.userAgent;")
+        except Exception:
+            user_agent = None
+        if not self.probe(cookies, user_agent):
+            log.info("Saved session is no longer logged in")
+            self.clear()
+            return False
+        browser.get(COOKIE_PAGE)
+        for cookie in cookies:
+            cookie = {key: value for key, value in cookie.items()
+                      if key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'expiry', 'sameSite')}
+            try:
+                browser.add_cookie(cookie)
+            except Exception as e:
+                log.debug("Could not restore cookie %s: %s", cookie.get('name'), e)
+        return True
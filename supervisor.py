@@ -0,0 +1,154 @@
+from __future__ import annotations
+import logging
+import time
+
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        InvalidSessionIdException, NoSuchWindowException,
+                                        StaleElementReferenceException, TimeoutException, WebDriverException)
+
+log = logging.getLogger(__name__)
+
+TRANSIENT = 'transient'
+JOB = 'job'
+SESSION = 'session'
+
+# WebDriverException messages of a browser that is gone for good
+_session_messages: tuple = ('invalid session id', 'chrome not reachable', 'disconnected', 'no such window',
+                            'session deleted', 'target window already closed', 'connection refused',
+                            'max retries exceeded')
+
+# Closes the Easy Apply modal: confirms "Discard" when asked, otherwise clicks dismiss.
+DISMISS_SCRIPT = """
+var discard = document.querySelector(
+    "button[data-control-name='discard_application_confirm_btn'], button[data-test-dialog-secondary-btn]");
+if (discard) { discard.click(); return 'discarded'; }
+var dismiss = document.querySelector(".jobs-easy-apply-modal button[aria-label='Dismiss'], .artdeco-modal__dismiss");
+if (dismiss) { dismiss.click(); return 'dismissed'; }
+return null;
+"""
+
+
+class ApplyAborted(RuntimeError):
+    """The bot can't go on: the circuit breaker tripped too often or the browser can't be restarted."""
+
+
+class CircuitOpen(RuntimeError):
+    """Too many failures in a row, the current turn should end."""
+
+
+def classify(error: BaseException) -> str:
+    """'session' when the browser is gone, 'transient' when trying again may work, 'job' otherwise."""
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException, ConnectionError)):
+        return SESSION
+    # the driver's HTTP client reports a dead chromedriver with its own exception types
+    message: str = str(error).lower()
+    if any(text in message for text in _session_messages):
+        return SESSION
+    if isinstance(error, (TimeoutException, StaleElementReferenceException, ElementClickInterceptedException,
+                          ElementNotInteractableException, WebDriverException)):
+        return TRANSIENT
+    return JOB
+
+
+class CircuitBreaker:
+    """Opens after `threshold` failures in a row and stays open for `cooldown`
+    seconds, doubling for every trip without a success in between.
+    After `max_trips` such trips the run is given up."""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 300, max_trips: int = 3) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_trips = max_trips
+        self.failures: int = 0
+        self.trips: int = 0
+        self.open_until: float = 0.0
+
+    def success(self) -> None:
+        self.failures = 0
+        self.trips = 0
+
+    def failure(self) -> bool:
+        """Count a failure; True when this one trips the breaker."""
+        self.failures += 1
+        if self.failures < self.threshold:
+            return False
+        self.failures = 0
+        self.trips += 1
+        if self.trips >= self.max_trips:
+            raise ApplyAborted(f"circuit breaker tripped {self.trips} times in a row")
+        self.open_until = time.monotonic() + self.cooldown * 2 ** (self.trips - 1)
+        return True
+
+    def remaining(self) -> float:
+        return max(0.0, self.open_until - time.monotonic())
+
+
+class ApplySupervisor:
+    """Runs the bot's steps, telling apart failures worth a retry from ones that are not.
+
+    Transient failures are retried with exponential backoff, a job that
+    fails for any other reason is given up, and a dead browser is replaced
+    through bot.restart_browser() before the step is tried again. Broken
+    Easy Apply modals are discarded after every failure. Time lost to
+    failed attempts and backoff is recorded as the 'wasted' metric.
+    """
+
+    def __init__(self, bot, retries: int = 2, backoff: float = 5.0, breaker: CircuitBreaker | None = None) -> None:
+        self.bot = bot
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+
+    def wait_if_open(self) -> None:
+        remaining: float = self.breaker.remaining()
+        if remaining > 0:
+            log.warning("Circuit breaker open, resuming in %.0fs", remaining)
+            self.waste(remaining, sleep=True)
+
+    def call(self, what: str, action, *args, **kwargs) -> tuple:
+        """(True, result) once `action` succeeds, (False, None) when it was given up."""
+        attempt: int = 0
+        while True:
+            self.wait_if_open()
+            start: float = time.monotonic()
+            try:
+                value = action(*args, **kwargs)
+            except (ApplyAborted, CircuitOpen):
+                raise
+            except Exception as e:
+                kind: str = self.handle(e, what)
+                self.waste(time.monotonic() - start)
+                if kind == JOB or attempt >= self.retries:
+                    log.info("Giving up on %s after %d attempts", what, attempt + 1)
+                    return False, None
+                attempt += 1
+                self.waste(self.backoff * 2 ** (attempt - 1), sleep=True)
+                continue
+            self.breaker.success()
+            return True, value
+
+    def handle(self, error: Exception, what: str) -> str:
+        """Classify a failure and get the browser back into a usable state."""
+        kind: str = classify(error)
+        log.warning("%s failure in %s: %s", kind, what, error, exc_info=kind == JOB)
+        if kind == SESSION:
+            self.bot.restart_browser()
+        else:
+            self.dismiss_modal()
+        if self.breaker.failure():
+            raise CircuitOpen(f"{self.breaker.threshold} failures in a row, last in {what}: {error}")
+        return kind
+
+    def dismiss_modal(self) -> None:
+        try:
+            for _ in range(2):
+                if not self.bot.browser.execute_script(DISMISS_SCRIPT):
+                    break
+                time.sleep(1)
+        except Exception as e:
+            log.debug("Could not dismiss the Easy Apply modal: %s", e)
+
+    def waste(self, seconds: float, sleep: bool = False) -> None:
+        if sleep:
+            time.sleep(seconds)
+        self.bot.metrics.observe('wasted', seconds, self.bot.combo_label)
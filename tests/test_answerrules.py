@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+import unittest
+
+from answerrules import AnswerCache, QuestionMatcher, normalize_question, pick_option
+from easyapplyform import FormOption, FormQuestion
+
+PROFILE: dict = {'first_name': 'Ada', 'last_name': 'Lovelace', 'salary': '120000', 'experience': '5',
+                 'address': '1 Main St', 'city': 'Springfield', 'state': 'Illinois', 'zipcode': '62701',
+                 'country': 'United States', 'phone_number': '5555550100'}
+
+
+def yes_no(label: str, kind: str = 'radio') -> FormQuestion:
+    return FormQuestion(label, kind, options=[FormOption('Yes', 'Yes', 'yes'), FormOption('No', 'No', 'no')])
+
+
+class QuestionMatcherTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.matcher = QuestionMatcher(None, dict(PROFILE))
+
+    def answer(self, label: str, kind: str = 'text'):
+        return self.matcher.answer(FormQuestion(label, kind))
+
+    def test_profile_fields(self) -> None:
+        self.assertEqual(self.answer("First name"), 'Ada')
+        self.assertEqual(self.answer("City"), 'Springfield')
+        self.assertEqual(self.answer("Mobile phone number", 'tel'), '5555550100')
+        self.assertEqual(self.answer("How did you hear about us?"), 'LinkedIn')
+
+    def test_whole_words(self) -> None:
+        self.assertIsNone(self.answer("Personal statement", 'textarea'))
+
+    def test_salary_is_not_experience(self) -> None:
+        self.assertEqual(self.answer("What is your expected salary per year?"), '120000')
+        self.assertIsNone(self.answer("What year did you graduate?"))
+        self.assertEqual(self.answer("How many years of experience do you have with Python?", 'number'), '5')
+
+    def test_email_is_not_an_address(self) -> None:
+        self.assertIsNone(self.answer("Email address"))
+        self.assertIsNone(self.answer("E-mail Address"))
+        self.assertEqual(self.answer("Street address"), '1 Main St')
+
+    def test_option_questions_fall_through_to_yes(self) -> None:
+        answer = self.matcher.answer(yes_no("Are you legally authorized to work in this country?"))
+        self.assertEqual(answer.text, 'Yes')
+        answer = self.matcher.answer(yes_no("Do you live in the city?", 'select'))
+        self.assertEqual(answer.text, 'Yes')
+
+    def test_match_names_the_rule(self) -> None:
+        self.assertEqual(self.matcher.match(FormQuestion("Desired salary", 'number')), ('120000', 'salary'))
+        self.assertEqual(self.matcher.match(FormQuestion("Favourite colour", 'text')), (None, None))
+
+    def test_custom_rules(self) -> None:
+        matcher = QuestionMatcher([{'name': 'visa', 'regex': r'\bvisa\b', 'answer': 'No'},
+                                   {'name': 'missing', 'keywords': ['github'], 'answer': '{github}'}], PROFILE)
+        self.assertEqual(matcher.answer(FormQuestion("Do you need a visa?", 'text')), 'No')
+        # an unknown profile field makes the rule unusable instead of raising
+        self.assertIsNone(matcher.answer(FormQuestion("GitHub profile", 'text')))
+
+
+class PickOptionTest(unittest.TestCase):
+
+    def test_falls_back_to_the_last_option(self) -> None:
+        question = yes_no("Pick one", 'select')
+        self.assertEqual(pick_option(question, 'yes').text, 'Yes')
+        self.assertEqual(pick_option(question, 'Maybe').text, 'No')
+
+
+class AnswerCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.tmp.name, 'answers.json')
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_only_committed_answers_are_kept(self) -> None:
+        cache = AnswerCache(self.path)
+        question = FormQuestion("Notice period?", 'text')
+        cache.remember(question, '2 weeks')
+        cache.discard()
+        cache.commit()
+        self.assertFalse(os.path.isfile(self.path))
+        cache.remember(question, '2 weeks')
+        cache.commit()
+        self.assertEqual(AnswerCache(self.path).lookup(question), ('2 weeks', None))
+
+    def test_rule_answers_follow_the_profile(self) -> None:
+        profile: dict = dict(PROFILE)
+        matcher = QuestionMatcher(None, profile)
+        question = FormQuestion("Expected salary", 'number')
+        cache = AnswerCache(self.path)
+        cache.remember(question, *matcher.match(question))
+        cache.commit()
+        profile['salary'] = '150000'
+        self.assertEqual(AnswerCache(self.path).lookup(question, matcher), ('150000', 'salary'))
+
+    def test_kind_must_match(self) -> None:
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({normalize_question("Start date?"): {'kind': 'text', 'answer': 'ASAP'}}, f)
+        cache = AnswerCache(self.path)
+        self.assertEqual(cache.lookup(FormQuestion("Start date", 'text')), ('ASAP', None))
+        self.assertEqual(cache.lookup(FormQuestion("Start date", 'select')), (None, None))
+
+    def test_unreadable_file(self) -> None:
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{not json')
+        self.assertEqual(AnswerCache(self.path).answers, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+
+from backends import ReplayBackend
+from easyapplybot import EasyApplyBot
+from metrics import Metrics
+
+PROFILE: dict = {'first_name': 'Ada', 'last_name': 'Lovelace', 'salary': '120000', 'experience': '5',
+                 'address': '1 Main St', 'city': 'Springfield', 'state': 'Illinois', 'zipcode': '62701',
+                 'country': 'United States', 'phone_number': '5555550100'}
+
+
+class ReplayBackendTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.workdir: str = self.tmp.name
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_bot_starts_from_a_trace_without_login(self) -> None:
+        # recorded on a saved session, so the trace has no login steps
+        open(os.path.join(self.workdir, 'trace.jsonl'), 'w').close()
+        browser = ReplayBackend(self.workdir)
+        bot = EasyApplyBot(username='replay@example.com', password='not-used',
+                           filename=os.path.join(self.workdir, 'output.csv'),
+                           applied_store=os.path.join(self.workdir, 'applied_jobs.db'),
+                           answer_cache=os.path.join(self.workdir, 'answers.json'),
+                           fingerprint_index=os.path.join(self.workdir, 'fingerprints.db'),
+                           metrics=Metrics(None),
+                           checkpoint=None,
+                           browser=browser,
+                           prefetch=False,
+                           session_dir=None,
+                           **PROFILE)
+        try:
+            self.assertEqual(browser.actions, [])
+            self.assertIsNone(bot.prescreener)
+        finally:
+            bot.finish_apply()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from jobfilter import JobFilter, TermMatcher, words
+
+
+class WordsTest(unittest.TestCase):
+
+    def test_keeps_language_names_together(self) -> None:
+        self.assertEqual(words("Senior C++ / C# and .NET Engineer"), ['senior', 'c++', 'c#', 'and', 'net', 'engineer'])
+
+    def test_empty(self) -> None:
+        self.assertEqual(words(None), [])
+        self.assertEqual(words(''), [])
+
+
+class TermMatcherTest(unittest.TestCase):
+
+    def test_whole_words_only(self) -> None:
+        matcher = TermMatcher(['java'])
+        self.assertEqual(matcher.search("Java Developer"), 'java')
+        self.assertIsNone(matcher.search("JavaScript Developer"))
+
+    def test_phrases(self) -> None:
+        matcher = TermMatcher(['machine learning', 'lead'])
+        self.assertEqual(matcher.search("Senior Machine  Learning Engineer"), 'machine learning')
+        self.assertIsNone(matcher.search("Machine Operator, learning on the job"))
+        self.assertEqual(matcher.search("Team Lead"), 'lead')
+
+    def test_regex_terms(self) -> None:
+        matcher = TermMatcher([r're:\bsr\b', 'intern'])
+        self.assertEqual(matcher.search("Sr. Engineer"), 'Sr')
+        self.assertEqual(matcher.search("Summer Intern"), 'intern')
+        self.assertIsNone(matcher.search("Internal Tools Engineer"))
+
+    def test_invalid_regex(self) -> None:
+        with self.assertRaises(ValueError):
+            TermMatcher(['re:(unclosed'])
+
+    def test_empty_matcher(self) -> None:
+        matcher = TermMatcher([None, ''])
+        self.assertFalse(matcher)
+        self.assertIsNone(matcher.search("anything"))
+
+
+class JobFilterTest(unittest.TestCase):
+
+    def test_blacklists(self) -> None:
+        job_filter = JobFilter(blacklist=['Acme'], blackListTitles=['Senior'])
+        self.assertEqual(job_filter.reject("Senior Developer", "Initech"), "* Blacklisted title (Senior)")
+        self.assertEqual(job_filter.reject("Developer", "Acme Corp"), "* Blacklisted company (Acme)")
+        self.assertIsNone(job_filter.reject("Developer", "Initech"))
+
+    def test_allow_list(self) -> None:
+        job_filter = JobFilter(rules={'location': {'allow': ['remote', 'Berlin']}})
+        self.assertIsNone(job_filter.reject("Developer", "Initech", "Berlin, Germany"))
+        self.assertEqual(job_filter.reject("Developer", "Initech", "Paris, France"),
+                         "* Location not in allow list")
+
+    def test_block_wins_over_allow(self) -> None:
+        job_filter = JobFilter(rules={'title': {'block': ['manager'], 'allow': ['python']}})
+        self.assertEqual(job_filter.reject("Python Engineering Manager"), "* Blacklisted title (manager)")
+
+    def test_unknown_fields_are_kept(self) -> None:
+        job_filter = JobFilter(blacklist=['Acme'], rules={'location': {'allow': ['remote']}})
+        self.assertIsNone(job_filter.reject(None, None, None))
+
+    def test_unknown_rule_field(self) -> None:
+        with self.assertRaises(ValueError):
+            JobFilter(rules={'salary': {'block': ['unpaid']}})
+
+
+if __name__ == '__main__':
+    unittest.main()
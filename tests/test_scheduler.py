@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from checkpoint import Checkpoint
+from scheduler import ComboScheduler, TurnStats
+
+
+class SchedulerTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.workdir: str = self.tmp.name
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def scheduler(self, positions: list, locations: list, **settings) -> ComboScheduler:
+        settings.setdefault('stats_file', os.path.join(self.workdir, 'combo_stats.json'))
+        return ComboScheduler(positions, locations, **settings)
+
+
+class ComboSchedulerTest(SchedulerTestCase):
+
+    def test_round_robin_takes_turns(self) -> None:
+        scheduler = self.scheduler(['Python', 'Go'], ['Remote'], strategy='round_robin')
+        first = scheduler.next()
+        scheduler.report(first, TurnStats(applications=1, pages=1, offset=25, seconds=60))
+        second = scheduler.next()
+        self.assertNotEqual(first.key, second.key)
+        scheduler.report(second, TurnStats(applications=1, pages=1, offset=25, seconds=60))
+        self.assertEqual(scheduler.next().key, first.key)
+
+    def test_yield_prefers_the_better_combo(self) -> None:
+        scheduler = self.scheduler(['Python', 'Go'], ['Remote'])
+        combos: dict = {}
+        for applications in (1, 4):
+            combo = scheduler.next()
+            combos[combo.key] = applications
+            scheduler.report(combo, TurnStats(applications=applications, pages=1, offset=25, seconds=60))
+        best: str = max(combos, key=combos.get)
+        self.assertEqual(scheduler.next().key, best)
+
+    def test_retirement(self) -> None:
+        scheduler = self.scheduler(['Python'], ['Remote', 'Berlin'], idle_turns=1, max_pages=2)
+        exhausted = scheduler.next()
+        scheduler.report(exhausted, TurnStats(applications=2, pages=1, exhausted=True))
+        self.assertEqual(exhausted.retired, 'no more results')
+        idle = scheduler.next()
+        scheduler.report(idle, TurnStats(pages=1, offset=25))
+        self.assertEqual(idle.retired, 'no new applications in 1 turns')
+        self.assertIsNone(scheduler.next())
+
+    def test_history_is_kept_between_runs(self) -> None:
+        scheduler = self.scheduler(['Python'], ['Remote'])
+        scheduler.report(scheduler.next(), TurnStats(applications=3, pages=1, offset=25, seconds=120))
+        again = self.scheduler(['Python'], ['Remote'])
+        self.assertEqual(again.history['Python|Remote'], {'applications': 3, 'seconds': 120})
+        self.assertEqual(again.yield_rate(again.combos[0]), 1.5)
+
+    def test_unknown_strategy(self) -> None:
+        with self.assertRaises(ValueError):
+            self.scheduler(['Python'], ['Remote'], strategy='random')
+
+
+class CheckpointTest(SchedulerTestCase):
+
+    def test_save_is_throttled(self) -> None:
+        checkpoint = Checkpoint(os.path.join(self.workdir, 'checkpoint.json'), interval=60)
+        self.assertTrue(checkpoint.save({'turn': 1}))
+        self.assertFalse(checkpoint.save({'turn': 2}))
+        self.assertEqual(checkpoint.load()['turn'], 1)
+        self.assertTrue(checkpoint.save({'turn': 3}, force=True))
+        self.assertEqual(checkpoint.load()['turn'], 3)
+
+    def test_unreadable_checkpoint(self) -> None:
+        path: str = os.path.join(self.workdir, 'checkpoint.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"turn": ')
+        self.assertIsNone(Checkpoint(path).load())
+
+    def test_interrupted_run_resumes_where_it_stopped(self) -> None:
+        path: str = os.path.join(self.workdir, 'checkpoint.json')
+        scheduler = self.scheduler(['Python', 'Go'], ['Remote'], checkpoint=Checkpoint(path))
+        finished = scheduler.next()
+        scheduler.report(finished, TurnStats(applications=1, pages=1, offset=25, seconds=60))
+        running = scheduler.next()
+        scheduler.progress(running, offset=50, inflight=[3001, 3002])
+        scheduler.save_checkpoint(force=True)
+
+        # the process dies here; a new run restores the checkpoint
+        resumed = self.scheduler(['Python', 'Go'], ['Remote'], checkpoint=Checkpoint(path))
+        resumed.restore(Checkpoint(path).load())
+        combos: dict = {combo.key: combo for combo in resumed.combos}
+        self.assertEqual(combos[finished.key].offset, 25)
+        self.assertEqual(combos[finished.key].turns, 1)
+        self.assertTrue(combos[running.key].interrupted)
+        self.assertEqual(combos[running.key].offset, 50)
+        self.assertEqual(combos[running.key].inflight, [3001, 3002])
+        # the interrupted combo goes first, whatever the strategy prefers
+        self.assertEqual(resumed.next().key, running.key)
+
+    def test_checkpoint_is_removed_when_every_combo_retired(self) -> None:
+        path: str = os.path.join(self.workdir, 'checkpoint.json')
+        scheduler = self.scheduler(['Python'], ['Remote'], checkpoint=Checkpoint(path))
+        combo = scheduler.next()
+        self.assertTrue(os.path.isfile(path))
+        scheduler.report(combo, TurnStats(pages=1, exhausted=True))
+        self.assertFalse(os.path.isfile(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
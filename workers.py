@@ -0,0 +1,134 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+from functools import partial
+
+from appliedstore import open_store
+from browserfactory import create_driver
+from easyapplybot import EasyApplyBot
+from leanmode import LeanMode
+from resultsink import open_result_writer
+from scheduler import ComboScheduler, TurnStats
+from checkpoint import Checkpoint
+from metrics import Metrics
+from pacing import Pacer
+from supervisor import ApplyAborted
+from fingerprints import FingerprintIndex
+
+log = logging.getLogger(__name__)
+
+
+class ApplyWorkerPool:
+    """Runs N browser sessions that take turns on (position, location) combos from a shared ComboScheduler.
+
+    Every worker gets its own Chrome profile directory and its own
+    EasyApplyBot, while the applied-jobs store and the result writer are
+    shared, so a jobID claimed by one worker is skipped by all others.
+    Logins happen one worker at a time so a manual security check only
+    ever blocks on one browser.
+    """
+
+    def __init__(self, bot_args: tuple, bot_kwargs: dict, concurrency: int = 2,
+                 profile_root: str = './profiles') -> None:
+        self.bot_args = bot_args
+        self.bot_kwargs = dict(bot_kwargs)
+        self.concurrency = max(1, int(concurrency))
+        self.profile_root = profile_root
+        self.scheduler: ComboScheduler | None = None
+        self.bots: list = []
+
+    def create_browser(self, index: int):
+        lean = LeanMode(self.bot_kwargs.get('lean_block_types'), self.bot_kwargs.get('lean_block_patterns')) \
+            if self.bot_kwargs.get('lean_mode') else None
+        return create_driver(EasyApplyBot.browser_options(lean),
+                             headless=self.bot_kwargs.get('headless', False),
+                             profile_dir=os.path.join(self.profile_root, f"worker-{index}"))
+
+    def run(self, positions: list, locations: list) -> None:
+        checkpoint_path: str | None = self.bot_kwargs.get('checkpoint', 'checkpoint.json')
+        checkpoint: Checkpoint | None = Checkpoint(checkpoint_path) if checkpoint_path else None
+        self.scheduler = ComboScheduler(positions, locations,
+                                        max_seconds=EasyApplyBot.MAX_SEARCH_TIME,
+                                        checkpoint=checkpoint,
+                                        **(self.bot_kwargs.get('scheduler_settings') or {}))
+        state: dict | None = checkpoint.load() if checkpoint and self.bot_kwargs.get('resume') else None
+        if state:
+            self.scheduler.restore(state)
+
+        store = open_store(self.bot_kwargs.pop('applied_store', 'applied_jobs.db'),
+                           self.bot_kwargs.pop('retention_days', 2))
+        # only a CSV history can be imported, jsonl and sqlite outputs are written alongside the store
+        filename: str = self.bot_kwargs.get('filename', 'output.csv')
+        if self.bot_kwargs.get('output_format', 'csv') == 'csv':
+            try:
+                store.import_csv(filename)
+            except Exception as e:
+                log.info(f"{e}   jobIDs could not be loaded from CSV {filename}")
+        fingerprint_path: str | None = self.bot_kwargs.pop('fingerprint_index', 'fingerprints.db')
+        fingerprints: FingerprintIndex | None = \
+            FingerprintIndex(fingerprint_path, self.bot_kwargs.pop('fingerprint_distance', 6)) \
+            if fingerprint_path else None
+        metrics = Metrics(self.bot_kwargs.pop('metrics_json', 'metrics.json'),
+                          self.bot_kwargs.pop('metrics_prometheus', None))
+        self.metrics = metrics
+        pacer = Pacer(**(self.bot_kwargs.pop('pacing_settings', None) or {}))
+        results = open_result_writer(self.bot_kwargs.get('filename', 'output.csv'),
+                                     self.bot_kwargs.pop('output_format', 'csv'),
+                                     flush_rows=self.bot_kwargs.pop('output_flush_rows', 20),
+                                     flush_seconds=self.bot_kwargs.pop('output_flush_seconds', 30))
+
+        threads: list = []
+        try:
+            # every bot is logged in before any thread starts, so a failed login
+            # never leaves running workers behind when the shared resources close
+            for index in range(min(self.concurrency, len(self.scheduler.combos))):
+                self.bots.append(EasyApplyBot(*self.bot_args,
+                                              applied_store=store,
+                                              results=results,
+                                              metrics=metrics,
+                                              pacer=pacer,
+                                              fingerprint_index=fingerprints,
+                                              browser=self.create_browser(index),
+                                              browser_factory=partial(self.create_browser, index),
+                                              **self.bot_kwargs))
+            for index, bot in enumerate(self.bots):
+                thread = threading.Thread(target=self.work, args=(bot,), name=f"worker-{index}")
+                thread.start()
+                threads.append(thread)
+            for thread in threads:
+                thread.join()
+        finally:
+            for bot in self.bots:
+                try:
+                    bot.finish_apply()
+                except Exception as e:
+                    log.info(f"Could not close browser: {e}")
+            metrics.write()
+            results.close()
+            store.close()
+            if fingerprints:
+                fingerprints.close()
+
+    def work(self, bot: EasyApplyBot) -> None:
+        name: str = threading.current_thread().name
+        while (combo := self.scheduler.next()) is not None:
+            log.info("%s: Applying to %s: %s from result %d", name, combo.position, combo.location, combo.offset)
+            try:
+                stats: TurnStats = bot.applications_loop(combo.position,
+                                                         "&location=" + combo.location,
+                                                         start_offset=combo.offset,
+                                                         time_budget=self.scheduler.time_budget,
+                                                         page_budget=self.scheduler.page_budget,
+                                                         progress=partial(self.scheduler.progress, combo),
+                                                         resume_jobs=combo.inflight)
+            except ApplyAborted as e:
+                log.error(f"{name}: stopping: {e}")
+                self.scheduler.report(combo, TurnStats(offset=combo.offset))
+                break
+            except Exception as e:
+                log.error(f"{name}: {combo.position}: {combo.location} failed: {e}")
+                stats = TurnStats(offset=combo.offset)
+            self.scheduler.report(combo, stats)
+            self.metrics.write()
+        log.info(f"{name}: no combos left")